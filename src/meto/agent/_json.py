@@ -0,0 +1,88 @@
+"""JSON record helpers shared by the agent modules.
+
+orjson is used when installed (``pip install meto[fast]``). Whenever it is missing
+or rejects a value, the stdlib takes over and produces the same output, so callers
+never need to know which encoder ran.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from datetime import UTC, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted timestamp.
+_ts_prefix: tuple[int, str] = (-1, "")
+
+
+def dumps(
+    obj: Any, *, indent: bool = False, newline: bool = False, ensure_ascii: bool = False
+) -> bytes:
+    """Encode obj as UTF-8 JSON.
+
+    The output is compact, or indented by two spaces with ``indent``; ``newline``
+    appends a trailing ``\\n``. Non-ASCII characters are written as-is unless
+    ``ensure_ascii`` is set.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits or lone surrogates
+        else:
+            # orjson cannot escape non-ASCII; its output is only usable as-is if pure ASCII.
+            if not ensure_ascii or data.isascii():
+                return data
+
+    separators = (",", ": ") if indent else (",", ":")
+    text = json.dumps(
+        obj, indent=2 if indent else None, separators=separators, ensure_ascii=ensure_ascii
+    )
+    if newline:
+        text += "\n"
+    try:
+        return text.encode("utf-8")
+    except UnicodeEncodeError:
+        # Lone surrogates have no UTF-8 form; escaping them still yields valid JSON.
+        return dumps(obj, indent=indent, newline=newline, ensure_ascii=True)
+
+
+def loads(raw: str | bytes) -> Any:
+    """Parse JSON text, raising json.JSONDecodeError for invalid input.
+
+    orjson is stricter than the stdlib (e.g. NaN, huge integers), so its rejects
+    are retried with json.loads, which also produces the error for invalid input.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def iso_timestamp(created: float | None = None) -> str:
+    """Format an epoch timestamp (default: now) like ``datetime.isoformat()`` in UTC.
+
+    Records arrive in bursts within the same second, so the date/time prefix is
+    cached per second and only the microseconds are formatted per record.
+    """
+    global _ts_prefix
+    total_micros = time.time_ns() // 1000 if created is None else int(created * 1_000_000)
+    sec, micros = divmod(total_micros, 1_000_000)
+    cached_sec, prefix = _ts_prefix
+    if sec != cached_sec:
+        prefix = datetime.fromtimestamp(sec, tz=UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        _ts_prefix = (sec, prefix)
+    return f"{prefix}.{micros:06d}+00:00"
@@ -35,6 +35,7 @@ class Agent:
     tools: list[dict[str, Any]]
     max_turns: int
     run_hooks: bool
+    _tool_name_set: frozenset[str]
 
     @classmethod
     def main(cls, session: Session) -> Agent:
@@ -138,6 +139,8 @@ class Agent:
         self.run_hooks = run_hooks
 
         self.tools = get_tools_for_agent(allowed_tools)
+        # has_tool() runs for every tool call; the tool set is fixed per agent.
+        self._tool_name_set = frozenset(self.tool_names)
 
     @property
     def tool_names(self) -> list[str]:
@@ -146,4 +149,4 @@ class Agent:
 
     def has_tool(self, tool_name: str) -> bool:
         """Return True if this agent exposes the given tool name."""
-        return tool_name in self.tool_names
+        return tool_name in self._tool_name_set
@@ -17,16 +17,18 @@ from __future__ import annotations
 import json
 import logging
 import signal
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from functools import lru_cache
 from typing import TYPE_CHECKING, Any, cast
 
 from openai import OpenAI
+from openai.lib.streaming.chat import ChatCompletionStreamState
 
+from meto.agent import _json
 from meto.agent.exceptions import AgentInterrupted, MaxStepsExceededError
 from meto.agent.hooks import get_hooks_manager
 from meto.agent.reasoning_log import ReasoningLogger
-from meto.agent.system_prompt import build_system_prompt
+from meto.agent.system_prompt import build_system_prompt_parts
 from meto.agent.tool_runner import run_tool  # pyright: ignore[reportImportCycles]
 from meto.conf import settings
 
@@ -50,6 +52,80 @@ def _get_client() -> OpenAI:
     return OpenAI(api_key=settings.LLM_API_KEY, base_url=settings.LLM_BASE_URL)
 
 
+def _create_completion(messages: Any, tools: Any, reasoning_logger: ReasoningLogger) -> Any:
+    """Request the next model response.
+
+    With ``STREAM_RESPONSES`` enabled the response is streamed: content is echoed to
+    the console as it arrives and the chunks (including tool-call fragments) are
+    assembled into the same ChatCompletion shape a non-streamed call returns.
+    """
+    client = _get_client()
+    if not settings.STREAM_RESPONSES:
+        return client.chat.completions.create(
+            model=settings.DEFAULT_MODEL, messages=messages, tools=tools
+        )
+
+    state = ChatCompletionStreamState()
+    stream = client.chat.completions.create(
+        model=settings.DEFAULT_MODEL,
+        messages=messages,
+        tools=tools,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    with stream:
+        for chunk in stream:
+            state.handle_chunk(chunk)
+            if chunk.choices and chunk.choices[0].delta.content:
+                reasoning_logger.log_content_delta(chunk.choices[0].delta.content)
+    return state.get_final_completion()
+
+
+def _tool_call_dict(tool_call: Any) -> dict[str, Any]:
+    """Convert an SDK tool call to the JSON-shaped dict stored in history.
+
+    Function calls (the only kind we request) are copied field by field, which is
+    cheaper than a generic ``model_dump()``; anything else falls back to it.
+    """
+    if getattr(tool_call, "type", None) == "function":
+        fn = tool_call.function
+        return {
+            "id": tool_call.id,
+            "function": {"arguments": fn.arguments, "name": fn.name},
+            "type": "function",
+        }
+    return tool_call.model_dump()
+
+
+def _system_prompt_for_turn(agent: Agent) -> tuple[str, str]:
+    """Return the (static, dynamic) system prompt parts for the next model call.
+
+    With ``BOOTSTRAP_FREEZE_MODE="session"`` the prompt is built once and reused until
+    the session resets it (new/cleared/compacted session, mode change), so AGENTS.md
+    edits only reach the prompt then. Otherwise it is rebuilt every turn.
+    """
+    session = agent.session
+    if settings.BOOTSTRAP_FREEZE_MODE != "session":
+        return build_system_prompt_parts(session, agent)
+    if session.frozen_system_prompt is None:
+        session.frozen_system_prompt = build_system_prompt_parts(session, agent)
+    return session.frozen_system_prompt
+
+
+def _system_messages(static: str, dynamic: str) -> list[dict[str, Any]]:
+    """Build the two system messages; a frozen prefix is marked as cacheable."""
+    if settings.BOOTSTRAP_FREEZE_MODE != "session":
+        first: dict[str, Any] = {"role": "system", "content": static}
+    else:
+        # Anthropic-style cache breakpoint; LiteLLM passes it through to providers
+        # that support explicit prompt caching.
+        first = {
+            "role": "system",
+            "content": [{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}],
+        }
+    return [first, {"role": "system", "content": dynamic}]
+
+
 def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
     """Run the agent loop for a single user prompt.
 
@@ -90,30 +166,36 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
         agent.session.history.append({"role": "user", "content": prompt})
         agent.session.session_logger.log_user(prompt)
 
+        # The prompt is rebuilt every turn (AGENTS.md and modes can change mid-loop),
+        # but the system messages are only replaced and logged when the prompt changes.
+        current_system_prompt: tuple[str, str] | None = None
+
+        # The OpenAI SDK uses large TypedDict unions for `messages` and `tools`.
+        # Our history is intentionally JSON-shaped, so treat these as dynamic.
+        # The request list is kept across turns: history is append-only within the
+        # loop, so each turn only swaps the system messages and copies new entries.
+        # The system prompt is sent as a stable prefix message plus a dynamic one.
+        history = agent.session.history
+        messages: Any = [{}, {}, *history]
+
         for _turn in range(agent.max_turns):
             # Check for interruption at the start of each turn
             if interrupted:
                 reasoning_logger.log_loop_completion("Interrupted by user (Ctrl-C)")
                 raise AgentInterrupted("Agent loop interrupted by user")
 
-            # The OpenAI SDK uses large TypedDict unions for `messages` and `tools`.
-            # Our history is intentionally JSON-shaped, so treat these as dynamic.
-            system_prompt = build_system_prompt(agent.session, agent)
-            messages: Any = [
-                {"role": "system", "content": system_prompt},
-                *agent.session.history,
-            ]
-            reasoning_logger.log_system_prompt(system_prompt)
-
-            resp = _get_client().chat.completions.create(
-                model=settings.DEFAULT_MODEL,
-                messages=messages,
-                tools=cast(Any, agent.tools),
-            )
+            system_prompt = _system_prompt_for_turn(agent)
+            if system_prompt != current_system_prompt:
+                messages[:2] = _system_messages(*system_prompt)
+                reasoning_logger.log_system_prompt("\n".join(system_prompt))
+                current_system_prompt = system_prompt
+            messages.extend(history[len(messages) - 2 :])
+
+            resp = _create_completion(messages, agent.tools, reasoning_logger)
 
             msg = resp.choices[0].message
             assistant_content = msg.content or ""
-            tool_calls: list[Any] = list(getattr(msg, "tool_calls", None) or [])
+            tool_calls: Sequence[Any] = getattr(msg, "tool_calls", None) or ()
 
             # Log model reasoning and response
             reasoning_logger.log_model_response(resp, settings.DEFAULT_MODEL)
@@ -122,8 +204,11 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
                 "role": "assistant",
                 "content": assistant_content,
             }
-            if tool_calls:
-                assistant_message["tool_calls"] = [tc.model_dump() for tc in tool_calls]
+            # Convert the SDK models once; the same dicts go into history, the session
+            # log and drive tool execution below.
+            tool_call_dicts = [_tool_call_dict(tc) for tc in tool_calls]
+            if tool_call_dicts:
+                assistant_message["tool_calls"] = tool_call_dicts
             if resp.usage:
                 assistant_message["prompt_tokens"] = resp.usage.prompt_tokens
                 assistant_message["completion_tokens"] = resp.usage.completion_tokens
@@ -135,34 +220,37 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
             if assistant_content:
                 yield assistant_content
 
-            if not tool_calls:
+            if not tool_call_dicts:
                 reasoning_logger.log_loop_completion("No more tool calls requested")
                 return
 
-            for tc in tool_calls:
-                tc_any = tc
-                if getattr(tc_any, "type", None) != "function":
+            for tc in tool_call_dicts:
+                if tc.get("type") != "function":
                     continue
 
-                fn = tc_any.function
-                fn_name = getattr(fn, "name", None)
+                tool_call_id = tc["id"]
+                fn = tc.get("function") or {}
+                fn_name = fn.get("name")
                 if not isinstance(fn_name, str) or not agent.has_tool(fn_name):
                     agent.session.history.append(
                         {
                             "role": "tool",
-                            "tool_call_id": tc_any.id,
+                            "tool_call_id": tool_call_id,
                             "content": f"Unknown tool: {fn_name}",
                         }
                     )
                     continue
 
                 try:
-                    arguments_raw = getattr(fn, "arguments", None) or "{}"
-                    arguments_any = json.loads(arguments_raw)
+                    arguments_raw = fn.get("arguments") or "{}"
+                    arguments_any = _json.loads(arguments_raw)
                 except (TypeError, json.JSONDecodeError) as e:
                     arguments_any = {}
                     logger.error(
-                        f"[{reasoning_logger.session_id}] Failed to parse arguments for {fn_name}: {e}"
+                        "[%s] Failed to parse arguments for %s: %s",
+                        reasoning_logger.session_id,
+                        fn_name,
+                        e,
                     )
 
                 arguments = (
@@ -175,7 +263,7 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
                         "pre_tool_use",
                         session_id=agent.session.session_id,
                         tool=fn_name,
-                        tool_call_id=tc_any.id,
+                        tool_call_id=tool_call_id,
                         params=arguments,
                     )
                     # Log each hook result
@@ -194,11 +282,11 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
                         agent.session.history.append(
                             {
                                 "role": "tool",
-                                "tool_call_id": tc_any.id,
+                                "tool_call_id": tool_call_id,
                                 "content": block_msg,
                             }
                         )
-                        agent.session.session_logger.log_tool(tc_any.id, block_msg)
+                        agent.session.session_logger.log_tool(tool_call_id, block_msg)
                         continue
 
                 # Execute tool (logging happens inside the tool runner)
@@ -215,7 +303,7 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
                         "post_tool_use",
                         session_id=agent.session.session_id,
                         tool=fn_name,
-                        tool_call_id=tc_any.id,
+                        tool_call_id=tool_call_id,
                         params=arguments,
                         result=tool_output[:1000] if tool_output else None,  # Truncate for hooks
                     )
@@ -230,11 +318,11 @@ def run_agent_loop(prompt: str, agent: Agent) -> Generator[str, None, None]:
                 agent.session.history.append(
                     {
                         "role": "tool",
-                        "tool_call_id": tc_any.id,
+                        "tool_call_id": tool_call_id,
                         "content": tool_output,
                     }
                 )
-                agent.session.session_logger.log_tool(tc_any.id, tool_output)
+                agent.session.session_logger.log_tool(tool_call_id, tool_output)
 
         reasoning_logger.log_loop_completion(f"Reached max turns ({agent.max_turns})")
         raise MaxStepsExceededError(f"Exceeded maximum of {agent.max_turns} turns")
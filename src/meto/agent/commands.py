@@ -22,8 +22,10 @@ Command precedence:
 from __future__ import annotations
 
 import argparse
+import asyncio
 import dataclasses
 import datetime
+import hashlib
 import re
 import shlex
 from collections.abc import Callable
@@ -31,12 +33,17 @@ from pathlib import Path
 from typing import Any
 
 import typer
-from openai import OpenAI
 
-from meto.agent.history_export import format_context_summary, save_agent_context
-from meto.agent.loaders import get_all_agents, get_skill_loader, parse_yaml_frontmatter
+from meto.agent.exceptions import ArgumentSubstitutionError
+from meto.agent.history_export import (
+    format_context_summary,
+    get_context_summary,
+    save_agent_context,
+)
+from meto.agent.loaders import get_all_agents, get_skill_loader, parse_yaml_frontmatter_bytes
 from meto.agent.modes.plan import PlanMode
-from meto.agent.session import Session, generate_session_id
+from meto.agent.session import Session
+from meto.agent.shell import split_command
 from meto.conf import settings
 
 
@@ -80,16 +87,7 @@ def _parse_slash_command_argv(text: str) -> list[str]:
     - `#` is NOT treated as a comment
     - Backslashes are preserved (important for Windows paths)
     """
-
-    # We intentionally avoid `shlex.split(..., posix=False)` because it tends to
-    # preserve quotes as literal characters. We also disable escaping because
-    # backslashes are common in Windows paths and should not be treated as
-    # escape sequences.
-    lexer = shlex.shlex(text, posix=True)
-    lexer.whitespace_split = True
-    lexer.commenters = ""
-    lexer.escape = ""
-    return list(lexer)
+    return split_command(text)
 
 
 def _validate_command_name(command: str) -> str:
@@ -120,26 +118,6 @@ def _validate_command_name(command: str) -> str:
     return name
 
 
-def _find_custom_command_file(command: str) -> Path | None:
-    """Search for custom command file in {settings.COMMANDS_DIR}/{command}.md.
-
-    Args:
-        command: Command string (may or may not start with /)
-
-    Returns:
-        Path to command file if it exists, None otherwise
-    """
-    try:
-        command_name = _validate_command_name(command)
-    except ValueError:
-        return None
-
-    # Construct path: {settings.COMMANDS_DIR}/{command}.md
-    command_path = settings.COMMANDS_DIR / f"{command_name}.md"
-
-    return command_path if command_path.is_file() else None
-
-
 def _load_custom_command(command_path: Path) -> CustomCommandSpec:
     """Load and parse custom command file with YAML frontmatter.
 
@@ -153,13 +131,14 @@ def _load_custom_command(command_path: Path) -> CustomCommandSpec:
         ValueError: If file cannot be read or parsed
     """
     try:
-        content = command_path.read_text(encoding="utf-8")
+        content = command_path.read_bytes()
     except OSError as e:
         raise ValueError(f"Failed to read custom command file: {e}") from e
+
+    try:
+        parsed = parse_yaml_frontmatter_bytes(content)
     except UnicodeDecodeError as e:
         raise ValueError(f"Failed to decode custom command file: {e}") from e
-
-    parsed = parse_yaml_frontmatter(content)
     metadata = parsed["metadata"]
     body = parsed["body"]
 
@@ -177,10 +156,6 @@ def _load_custom_command(command_path: Path) -> CustomCommandSpec:
 _ARG_INDEX_PATTERN = re.compile(r"\$ARGUMENTS\[(\d+)\]")
 
 
-class ArgumentSubstitutionError(Exception):
-    """Raised when argument substitution fails."""
-
-
 def _substitute_arguments(body: str, args: list[str]) -> str:
     """Substitute $ARGUMENTS and $ARGUMENTS[N] placeholders in command body.
 
@@ -329,7 +304,7 @@ def _cmd_export(args: list[str], session: Session) -> None:
         export_target, export_format, include_system = _parse_export_args(args)
     except ValueError as e:
         print(str(e))
-        print("Usage: /export [path] [--format json|pretty_json|markdown|text] [--full]")
+        print("Usage: /export [path] [--format json|pretty_json|jsonl|markdown|text] [--full]")
         return
 
     _export_history(
@@ -403,10 +378,7 @@ def _cmd_done(_args: list[str], session: Session) -> None:
 
     exit_result = session.exit_mode()
 
-    # Clear history completely
-    session.history.clear()
-    session.session_id = generate_session_id()
-    session.session_logger = session.session_logger_cls(session.session_id)
+    session.clear_history()
 
     # Insert follow-up instruction if provided by the mode.
     if exit_result and exit_result.followup_system_message:
@@ -440,10 +412,7 @@ def _cmd_implement(_args: list[str], session: Session) -> CommandResult | None:
 
     exit_result = session.exit_mode()
 
-    # Clear history completely
-    session.history.clear()
-    session.session_id = generate_session_id()
-    session.session_logger = session.session_logger_cls(session.session_id)
+    session.clear_history()
 
     # Insert follow-up instruction if provided by the mode.
     system_msg = None
@@ -528,7 +497,7 @@ COMMANDS: dict[str, SlashCommandSpec] = {
     "/export": SlashCommandSpec(
         handler=_cmd_export,
         description="Export conversation to a file (multiple formats)",
-        usage="/export [path] [--format json|pretty_json|markdown|text] [--full]",
+        usage="/export [path] [--format json|pretty_json|jsonl|markdown|text] [--full]",
     ),
     "/help": SlashCommandSpec(
         handler=_cmd_help,
@@ -558,6 +527,59 @@ COMMANDS: dict[str, SlashCommandSpec] = {
 }
 
 
+# Custom command files keyed by "/{stem}", cached by the COMMANDS_DIR path and its
+# mtime so that adding/removing command files invalidates it. A missing directory
+# is cached too (mtime None).
+_custom_command_files_cache: tuple[tuple[Path, int | None], dict[str, Path]] | None = None
+
+
+def _get_custom_command_files() -> dict[str, Path]:
+    """Return the custom command files in {settings.COMMANDS_DIR}, keyed by "/{command}".
+
+    The result is shared between calls; callers must not modify it.
+    """
+    global _custom_command_files_cache
+
+    commands_dir = settings.COMMANDS_DIR
+    try:
+        key = (commands_dir, commands_dir.stat().st_mtime_ns)
+    except OSError:
+        key = (commands_dir, None)
+
+    if _custom_command_files_cache is not None and _custom_command_files_cache[0] == key:
+        return _custom_command_files_cache[1]
+
+    command_files: dict[str, Path] = {}
+    if key[1] is not None:
+        for path in commands_dir.glob("*.md"):
+            try:
+                command_name = _validate_command_name(path.stem)
+            except ValueError:
+                continue
+            if path.is_file():
+                command_files[f"/{command_name}"] = path
+
+    _custom_command_files_cache = (key, command_files)
+    return command_files
+
+
+def _find_uncached_command_file(command: str) -> Path | None:
+    """Look up {settings.COMMANDS_DIR}/{command}.md directly, refreshing the table on a hit."""
+    global _custom_command_files_cache
+
+    try:
+        command_name = _validate_command_name(command)
+    except ValueError:
+        return None
+
+    command_path = settings.COMMANDS_DIR / f"{command_name}.md"
+    if not command_path.is_file():
+        return None
+
+    _custom_command_files_cache = None
+    return command_path
+
+
 def handle_slash_command(
     user_input: str,
     session: Session,
@@ -594,17 +616,20 @@ def handle_slash_command(
     if args == [""]:
         args = []
 
-    # Check built-in commands first
+    # Built-in commands shadow custom command files and never touch the disk.
     spec = COMMANDS.get(command)
     if spec is not None:
         result = spec.handler(args, session)
         return True, result
 
-    # Check for custom command file
-    custom_command_path = _find_custom_command_file(command)
-    if custom_command_path is not None:
+    entry = _get_custom_command_files().get(command)
+    if entry is None:
+        # Directory mtimes can be coarse; re-check the disk before reporting a miss.
+        entry = _find_uncached_command_file(command)
+
+    if entry is not None:
         try:
-            result = _execute_custom_command(args, custom_command_path, session)
+            result = _execute_custom_command(args, entry, session)
             return True, result
         except (ValueError, ArgumentSubstitutionError) as e:
             print(f"Custom command error: {e}")
@@ -615,6 +640,9 @@ def handle_slash_command(
     return True, None
 
 
+_EXPORT_FORMATS = ("json", "pretty_json", "jsonl", "markdown", "text")
+
+
 def _parse_export_args(args: list[str]) -> tuple[str, str, bool]:
     """Parse /export arguments.
 
@@ -630,12 +658,8 @@ def _parse_export_args(args: list[str]) -> tuple[str, str, bool]:
     """
     parser = argparse.ArgumentParser(add_help=False)
     parser.add_argument("path", nargs="?", default="")
-    parser.add_argument(
-        "format", nargs="?", default="json", choices={"json", "pretty_json", "markdown", "text"}
-    )
-    parser.add_argument(
-        "-f", "--format", dest="format_flag", choices={"json", "pretty_json", "markdown", "text"}
-    )
+    parser.add_argument("format", nargs="?", default="json", choices=_EXPORT_FORMATS)
+    parser.add_argument("-f", "--format", dest="format_flag", choices=_EXPORT_FORMATS)
     parser.add_argument("--full", "--include-system", action="store_true")
 
     try:
@@ -672,7 +696,7 @@ def _resolve_export_path(
 
     Args:
         export_target: User-provided path (may be empty, directory, or file)
-        export_format: Output format (json, pretty_json, markdown, text)
+        export_format: Output format (json, pretty_json, jsonl, markdown, text)
 
     Returns:
         Resolved Path object with filename and extension
@@ -680,6 +704,7 @@ def _resolve_export_path(
     ext_by_format = {
         "json": ".json",
         "pretty_json": ".json",
+        "jsonl": ".jsonl",
         "markdown": ".md",
         "text": ".txt",
     }
@@ -751,6 +776,21 @@ def _build_conversation_text(history: list[dict[str, Any]]) -> str:
     )
 
 
+_SUMMARY_INSTRUCTIONS = (
+    "Summarize the following conversation concisely. "
+    "Preserve key context, decisions, and technical details. "
+    "Output as a single paragraph."
+)
+
+
+def _summary_messages(conversation_text: str) -> list[dict[str, str]]:
+    """Build the chat messages for a summarization request."""
+    return [
+        {"role": "system", "content": _SUMMARY_INSTRUCTIONS},
+        {"role": "user", "content": conversation_text},
+    ]
+
+
 def _summarize_conversation(conversation_text: str) -> str:
     """Use LLM to create a concise summary of the conversation.
 
@@ -763,34 +803,155 @@ def _summarize_conversation(conversation_text: str) -> str:
     Raises:
         Exception: If LLM call fails
     """
+    # Imported lazily: only /compact needs the OpenAI client.
+    from openai import OpenAI
+
     client = OpenAI(api_key=settings.LLM_API_KEY, base_url=settings.LLM_BASE_URL)
 
-    resp = client.chat.completions.create(
-        model=settings.DEFAULT_MODEL,
-        messages=[
-            {
-                "role": "system",
-                "content": "Summarize the following conversation concisely. "
-                "Preserve key context, decisions, and technical details. "
-                "Output as a single paragraph.",
-            },
-            {"role": "user", "content": conversation_text},
-        ],
+    stream = client.chat.completions.create(
+        model=settings.SUMMARY_MODEL or settings.DEFAULT_MODEL,
+        messages=_summary_messages(conversation_text),
+        stream=True,
     )
-    return resp.choices[0].message.content or "Conversation summary unavailable."
+
+    # Stream the summary so the user sees progress instead of waiting on the full reply.
+    parts: list[str] = []
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            print(delta, end="", flush=True)
+    if parts:
+        print()
+
+    return "".join(parts) or "Conversation summary unavailable."
+
+
+def _summary_cache_path(conversation_text: str) -> Path:
+    """Return the cache file for a summary of conversation_text with the current model."""
+    model = settings.SUMMARY_MODEL or settings.DEFAULT_MODEL
+    key = hashlib.sha256(f"{model}\0{conversation_text}".encode()).hexdigest()
+    return settings.COMPACT_CACHE_DIR / f"{key}.txt"
+
+
+def _read_cached_summary(conversation_text: str) -> str | None:
+    """Return the cached summary for conversation_text, if any."""
+    try:
+        return _summary_cache_path(conversation_text).read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def _write_cached_summary(conversation_text: str, summary: str) -> None:
+    """Store summary in the cache (best-effort)."""
+    cache_path = _summary_cache_path(conversation_text)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(summary, encoding="utf-8")
+    except OSError:
+        # The cache is best-effort; compaction already succeeded.
+        pass
+
+
+def _summarize_conversation_cached(conversation_text: str) -> str:
+    """Return a cached summary for identical conversation text, or summarize and cache it."""
+    cached = _read_cached_summary(conversation_text)
+    if cached is not None:
+        return cached
+
+    summary = _summarize_conversation(conversation_text)
+    _write_cached_summary(conversation_text, summary)
+    return summary
+
+
+async def _summarize_many(conversation_texts: list[str]) -> list[str]:
+    """Summarize conversations concurrently, bounded by ``settings.COMPACT_CONCURRENCY``."""
+    # Imported lazily: only compaction needs the OpenAI client.
+    from openai import AsyncOpenAI
+
+    client = AsyncOpenAI(api_key=settings.LLM_API_KEY, base_url=settings.LLM_BASE_URL)
+    semaphore = asyncio.Semaphore(max(1, settings.COMPACT_CONCURRENCY))
+
+    async def summarize(conversation_text: str) -> str:
+        async with semaphore:
+            response = await client.chat.completions.create(
+                model=settings.SUMMARY_MODEL or settings.DEFAULT_MODEL,
+                messages=_summary_messages(conversation_text),
+            )
+        content = response.choices[0].message.content if response.choices else None
+        return content or "Conversation summary unavailable."
+
+    return await asyncio.gather(*(summarize(text) for text in conversation_texts))
+
+
+def compact_many(histories: list[list[dict[str, Any]]]) -> list[str]:
+    """Summarize many conversation histories in one batch.
+
+    Cached summaries are reused; the remaining conversations are summarized
+    concurrently instead of one blocking request at a time. Useful for
+    compacting archived sessions or subagent histories in bulk.
+
+    Args:
+        histories: Conversation histories to summarize
+
+    Returns:
+        One summary per history, in the same order ("" when a history has no
+        user/assistant messages)
+
+    Raises:
+        Exception: If an LLM call fails
+    """
+    texts = [_build_conversation_text(history) for history in histories]
+    summaries: list[str] = [""] * len(texts)
+
+    pending: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        if not text:
+            continue
+        cached = _read_cached_summary(text)
+        if cached is not None:
+            summaries[i] = cached
+        else:
+            pending.setdefault(text, []).append(i)
+
+    if pending:
+        results = asyncio.run(_summarize_many(list(pending)))
+        for (text, indices), summary in zip(pending.items(), results, strict=True):
+            _write_cached_summary(text, summary)
+            for i in indices:
+                summaries[i] = summary
+
+    return summaries
+
+
+def _compaction_split_index(history: list[dict[str, Any]], keep_tail: int) -> int:
+    """Return the index where the verbatim tail of the history starts.
+
+    The tail never starts with a tool message, so tool results stay attached to
+    the assistant message that requested them.
+    """
+    split = max(len(history) - keep_tail, 0)
+    while 0 < split < len(history) and history[split].get("role") == "tool":
+        split -= 1
+    return split
 
 
 def _compact_history(history: list[dict[str, Any]]) -> None:
     """Summarize conversation history to reduce token count.
 
-    Uses LLM to create a concise summary of the conversation,
-    then replaces the history with just the summary.
+    Uses LLM to create a concise summary of the older part of the conversation.
+    System messages and the last ``settings.COMPACT_KEEP_TAIL`` messages are
+    kept verbatim so the prompt prefix stays stable for provider-side caching.
     """
     if not history:
         print("No history to compact.")
         return
 
-    conversation_text = _build_conversation_text(history)
+    split = _compaction_split_index(history, settings.COMPACT_KEEP_TAIL)
+    head, tail = history[:split], history[split:]
+    conversation_text = _build_conversation_text(head)
 
     if not conversation_text:
         print("No conversation to compact.")
@@ -801,16 +962,48 @@ def _compact_history(history: list[dict[str, Any]]) -> None:
         return
 
     try:
-        summary = _summarize_conversation(conversation_text)
+        summary = _summarize_conversation_cached(conversation_text)
 
-        # Replace history with a single user message containing the summary
-        history.clear()
-        history.append(
+        # Keep system messages, replace the head with a summary, keep the tail as-is
+        system_messages = [msg for msg in head if msg["role"] == "system"]
+        history[:] = [
+            *system_messages,
             {
                 "role": "user",
                 "content": f"[Previous conversation summary]: {summary}",
-            }
+            },
+            *tail,
+        ]
+        print(
+            f"History compacted. ({len(conversation_text)} chars -> {len(summary)} chars, "
+            f"kept last {len(tail)} messages)"
         )
-        print(f"History compacted. ({len(conversation_text)} chars -> {len(summary)} chars)")
     except Exception as e:
         print(f"Compact failed: {e}")
+
+
+def maybe_auto_compact(session: Session) -> bool:
+    """Compact the session history when it nears the model's context window.
+
+    Runs when the /context token estimate reaches ``settings.AUTO_COMPACT_THRESHOLD``
+    of the context window; the default threshold of 0 disables it. Unlike /compact,
+    the session keeps its ID, mode and todos; only its log is rewritten.
+
+    Returns:
+        True if the history was compacted
+    """
+    threshold = settings.AUTO_COMPACT_THRESHOLD
+    if threshold <= 0 or not session.history:
+        return False
+
+    summary = get_context_summary(session.history)
+    if summary["total_tokens_estimate"] < threshold * summary["context_window_size"]:
+        return False
+
+    print("Conversation is nearing the context window; compacting history.")
+    before = len(session.history)
+    _compact_history(session.history)
+    if len(session.history) == before:
+        return False
+    session.rewrite_log()
+    return True
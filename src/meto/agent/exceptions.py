@@ -23,3 +23,7 @@ class ToolNotFoundError(AgentError):
 
 class AgentInterrupted(AgentError):
     """Raised when the agent loop is interrupted by user (Ctrl-C)."""
+
+
+class ArgumentSubstitutionError(AgentError):
+    """Raised when custom command argument substitution fails."""
@@ -4,13 +4,15 @@ Provides methods to extract, format, and save conversation history.
 """
 
 import hashlib
+import io
 import json
+from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, cast
 
-from rich.console import Console
-
+from meto.agent import _json
 from meto.conf import settings
 
 
@@ -26,7 +28,7 @@ def dump_agent_context(
 
     Args:
         history: The agent conversation history list
-        output_format: Output format - "json", "pretty_json", "markdown", or "text"
+        output_format: Output format - "json", "pretty_json", "jsonl", "markdown", or "text"
         include_system: Whether to include system messages in the output
         format: Deprecated alias for output_format (kept for compatibility)
 
@@ -37,17 +39,15 @@ def dump_agent_context(
     if not include_system:
         history_to_dump = [msg for msg in history if msg.get("role") != "system"]
 
-    if format is not None:
-        # Backwards-compatible alias.
-        if output_format != "json" and format != output_format:
-            raise ValueError("Provide only one of 'output_format' or deprecated 'format'.")
-        output_format = format
+    output_format = _resolve_output_format(output_format, format)
 
-    if output_format == "json":
-        return json.dumps(history_to_dump, indent=2)
+    if output_format in ("json", "pretty_json"):
+        return _json.dumps(
+            history_to_dump, indent=True, ensure_ascii=output_format == "json"
+        ).decode("utf-8")
 
-    elif output_format == "pretty_json":
-        return json.dumps(history_to_dump, indent=2, ensure_ascii=False)
+    elif output_format == "jsonl":
+        return b"".join(_iter_jsonl(history_to_dump)).decode("utf-8")
 
     elif output_format == "markdown":
         return _format_as_markdown(history_to_dump)
@@ -59,106 +59,215 @@ def dump_agent_context(
         raise ValueError(f"Unknown format: {output_format}")
 
 
-def _format_as_markdown(history: list[dict[str, Any]]) -> str:
-    """Format history as readable Markdown."""
-    lines = ["# Agent Conversation History\n"]
+def _resolve_output_format(output_format: str, format: str | None) -> str:
+    """Apply the deprecated ``format`` alias on top of ``output_format``."""
+    if format is not None:
+        # Backwards-compatible alias.
+        if output_format != "json" and format != output_format:
+            raise ValueError("Provide only one of 'output_format' or deprecated 'format'.")
+        return format
+    return output_format
 
-    for i, msg in enumerate(history, 1):
-        role = msg.get("role", "unknown").upper()
-        content = msg.get("content", "")
 
-        lines.append(f"## Message {i}: {role}\n")
+def _iter_json_array(messages: Iterable[dict[str, Any]], *, ensure_ascii: bool) -> Iterator[bytes]:
+    """Yield an indented JSON array one message at a time.
 
-        if role == "USER":
-            lines.append(f"{content}\n")
+    The output matches ``json.dumps(list(messages), indent=2)``. Nesting is
+    done by indenting every line of the encoded message; JSON strings never
+    contain raw newlines, so this cannot touch string contents.
+    """
+    sep = b"[\n  "
+    for msg in messages:
+        yield sep
+        yield _json.dumps(msg, indent=True, ensure_ascii=ensure_ascii).replace(b"\n", b"\n  ")
+        sep = b",\n  "
+    yield b"[]" if sep == b"[\n  " else b"\n]"
 
-        elif role == "ASSISTANT":
-            if content:
-                lines.append(f"**Response:**\n\n{content}\n")
 
-            if "tool_calls" in msg:
-                lines.append("**Tool Calls:**\n")
-                for tc in msg["tool_calls"]:
-                    fn = tc.get("function", {})
-                    fn_name = fn.get("name", "unknown")
-                    fn_args = fn.get("arguments", "{}")
+def _iter_jsonl(messages: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """Yield one JSON line per message."""
+    for msg in messages:
+        yield _json.dumps(msg, newline=True)
 
-                    # Parse arguments if it's a string
-                    if isinstance(fn_args, str):
-                        try:
-                            fn_args = json.loads(fn_args)
-                        except json.JSONDecodeError:
-                            pass
 
-                    lines.append(f"- **{fn_name}**")
-                    if isinstance(fn_args, dict) and fn_args:
-                        lines.append(f"  ```json\n  {json.dumps(fn_args, indent=2)}\n  ```")
-                    lines.append("")
+@lru_cache(maxsize=1024)
+def _parse_tool_arguments(raw: str) -> Any:
+    """Parse a tool-call arguments string, returning it unchanged if it is not JSON.
 
-        elif role == "TOOL":
-            tool_call_id = msg.get("tool_call_id", "unknown")
-            lines.append(f"**Tool Call ID:** `{tool_call_id}`\n")
-            lines.append(f"**Output:**\n\n{content}\n")
+    Cached by the raw string so repeated dumps of the same history do not
+    re-parse every tool call. Callers must treat the result as read-only.
+    """
+    try:
+        return _json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
 
-        elif role == "SYSTEM":
-            lines.append(f"```\n{content}\n```\n")
 
-        lines.append("")
+def _iter_tool_calls(msg: dict[str, Any]) -> Iterator[tuple[str, Any]]:
+    """Yield (function name, parsed arguments) for each tool call in a message."""
+    for tc in msg["tool_calls"]:
+        fn = tc.get("function", {})
+        fn_name = fn.get("name", "unknown")
+        fn_args = fn.get("arguments", "{}")
 
-    return "\n".join(lines)
+        # Parse arguments if it's a string
+        if isinstance(fn_args, str):
+            fn_args = _parse_tool_arguments(fn_args)
 
+        yield fn_name, fn_args
 
-def _format_as_text(history: list[dict[str, Any]]) -> str:
-    """Format history as simple readable text."""
-    lines = ["=" * 80]
-    lines.append("AGENT CONVERSATION HISTORY")
-    lines.append("=" * 80)
-    lines.append("")
+
+# Per-role message formatters. Each receives the output writer and the message.
+# Every line after the first line of a document is written with a leading
+# newline, which reproduces "\n".join(lines) without an intermediate list.
+Writer = Callable[[str], object]
+MessageFormatter = Callable[[Writer, dict[str, Any]], None]
+
+
+def _md_user(w: Writer, msg: dict[str, Any]) -> None:
+    w(f"\n{msg.get('content', '')}\n")
+
+
+def _md_assistant(w: Writer, msg: dict[str, Any]) -> None:
+    content = msg.get("content", "")
+    if content:
+        w(f"\n**Response:**\n\n{content}\n")
+
+    if "tool_calls" in msg:
+        w("\n**Tool Calls:**\n")
+        for fn_name, fn_args in _iter_tool_calls(msg):
+            w(f"\n- **{fn_name}**")
+            if isinstance(fn_args, dict) and fn_args:
+                args_json = _json.dumps(fn_args, indent=True, ensure_ascii=True).decode("utf-8")
+                w(f"\n  ```json\n  {args_json}\n  ```")
+            w("\n")
+
+
+def _md_tool(w: Writer, msg: dict[str, Any]) -> None:
+    tool_call_id = msg.get("tool_call_id", "unknown")
+    w(f"\n**Tool Call ID:** `{tool_call_id}`\n")
+    w(f"\n**Output:**\n\n{msg.get('content', '')}\n")
+
+
+def _md_system(w: Writer, msg: dict[str, Any]) -> None:
+    w(f"\n```\n{msg.get('content', '')}\n```\n")
+
+
+_MARKDOWN_FORMATTERS: dict[str, MessageFormatter] = {
+    "user": _md_user,
+    "assistant": _md_assistant,
+    "tool": _md_tool,
+    "system": _md_system,
+}
+
+
+def _text_user(w: Writer, msg: dict[str, Any]) -> None:
+    w("\n")
+    w(msg.get("content", ""))
+
+
+def _text_assistant(w: Writer, msg: dict[str, Any]) -> None:
+    content = msg.get("content", "")
+    if content:
+        w(f"\nResponse:\n{content}")
+
+    if "tool_calls" in msg:
+        w("\n\nTool Calls:")
+        for fn_name, fn_args in _iter_tool_calls(msg):
+            w(f"\n  - {fn_name}")
+            if isinstance(fn_args, dict) and fn_args:
+                # JSON tool arguments are expected to be a mapping of string keys to values.
+                args_dict = cast(dict[str, Any], fn_args)
+                for key, value in args_dict.items():
+                    w(f"\n      {key}: {value}")
+
+
+def _text_tool(w: Writer, msg: dict[str, Any]) -> None:
+    tool_call_id = msg.get("tool_call_id", "unknown")
+    w(f"\nTool Call ID: {tool_call_id}")
+    w(f"\nOutput:\n{msg.get('content', '')}")
+
+
+def _text_system(w: Writer, msg: dict[str, Any]) -> None:
+    w(f"\n[System Message]\n{msg.get('content', '')}")
+
+
+_TEXT_FORMATTERS: dict[str, MessageFormatter] = {
+    "user": _text_user,
+    "assistant": _text_assistant,
+    "tool": _text_tool,
+    "system": _text_system,
+}
+
+
+def _write_markdown(history: Iterable[dict[str, Any]], w: Writer) -> None:
+    """Write history as readable Markdown through ``w``."""
+    w("# Agent Conversation History\n")
+
+    for i, msg in enumerate(history, 1):
+        role = msg.get("role", "unknown")
+        w(f"\n## Message {i}: {role.upper()}\n")
+
+        formatter = _MARKDOWN_FORMATTERS.get(role)
+        if formatter is not None:
+            formatter(w, msg)
+
+        w("\n")
+
+
+def _write_text(history: Iterable[dict[str, Any]], w: Writer) -> None:
+    """Write history as simple readable text through ``w``."""
+    w("=" * 80)
+    w("\nAGENT CONVERSATION HISTORY")
+    w("\n" + "=" * 80)
+    w("\n")
 
     for i, msg in enumerate(history, 1):
-        role = msg.get("role", "unknown").upper()
-        content = msg.get("content", "")
+        role = msg.get("role", "unknown")
+        w(f"\n\n[Message {i}] {role.upper()}")
+        w("\n" + "-" * 40)
+
+        formatter = _TEXT_FORMATTERS.get(role)
+        if formatter is not None:
+            formatter(w, msg)
+
+    w("\n\n" + "=" * 80)
+
+
+def _format_as_markdown(history: list[dict[str, Any]]) -> str:
+    """Format history as readable Markdown."""
+    buf = io.StringIO()
+    _write_markdown(history, buf.write)
+    return buf.getvalue()
 
-        lines.append(f"\n[Message {i}] {role}")
-        lines.append("-" * 40)
 
-        if role == "USER":
-            lines.append(content)
+def _format_as_text(history: list[dict[str, Any]]) -> str:
+    """Format history as simple readable text."""
+    buf = io.StringIO()
+    _write_text(history, buf.write)
+    return buf.getvalue()
 
-        elif role == "ASSISTANT":
-            if content:
-                lines.append(f"Response:\n{content}")
 
-            if "tool_calls" in msg:
-                lines.append("\nTool Calls:")
-                for tc in msg["tool_calls"]:
-                    fn = tc.get("function", {})
-                    fn_name = fn.get("name", "unknown")
-                    fn_args = fn.get("arguments", "{}")
+# Parent directories already created by save_agent_context in this process.
+_ensured_dirs: set[Path] = set()
 
-                    if isinstance(fn_args, str):
-                        try:
-                            fn_args = json.loads(fn_args)
-                        except json.JSONDecodeError:
-                            pass
 
-                    lines.append(f"  - {fn_name}")
-                    if isinstance(fn_args, dict) and fn_args:
-                        # JSON tool arguments are expected to be a mapping of string keys to values.
-                        args_dict = cast(dict[str, Any], fn_args)
-                        for key, value in args_dict.items():
-                            lines.append(f"      {key}: {value}")
+def _ensure_dir(directory: Path) -> None:
+    """Create directory (and parents), skipping mkdir for directories we already made.
 
-        elif role == "TOOL":
-            tool_call_id = msg.get("tool_call_id", "unknown")
-            lines.append(f"Tool Call ID: {tool_call_id}")
-            lines.append(f"Output:\n{content}")
+    A cheap ``is_dir`` check still guards against the directory having been
+    removed since it was first created.
+    """
+    if directory in _ensured_dirs and directory.is_dir():
+        return
+    directory.mkdir(parents=True, exist_ok=True)
+    _ensured_dirs.add(directory)
 
-        elif role == "SYSTEM":
-            lines.append(f"[System Message]\n{content}")
 
-    lines.append("\n" + "=" * 80)
-    return "\n".join(lines)
+_DOCUMENT_WRITERS: dict[str, Callable[[Iterable[dict[str, Any]], Writer], None]] = {
+    "markdown": _write_markdown,
+    "text": _write_text,
+}
 
 
 def save_agent_context(
@@ -175,26 +284,65 @@ def save_agent_context(
     Args:
         history: The agent conversation history
         filepath: Path where to save the context
-        output_format: Output format ("json", "pretty_json", "markdown", "text")
+        output_format: Output format ("json", "pretty_json", "jsonl", "markdown", "text")
         include_system: Whether to include system messages in the output
         format: Deprecated alias for output_format (kept for compatibility)
     """
-    content = dump_agent_context(
-        history,
-        output_format,
-        include_system=include_system,
-        format=format,
-    )
+    output_format = _resolve_output_format(output_format, format)
 
     filepath = Path(filepath)
-    filepath.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(filepath.parent)
 
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(content)
+    # Stream one message at a time instead of building the whole document.
+    messages: Iterable[dict[str, Any]] = history
+    if not include_system:
+        messages = (msg for msg in history if msg.get("role") != "system")
+
+    if output_format in ("json", "pretty_json"):
+        with open(filepath, "wb") as f:
+            f.writelines(_iter_json_array(messages, ensure_ascii=output_format == "json"))
+    elif output_format == "jsonl":
+        with open(filepath, "wb") as f:
+            f.writelines(_iter_jsonl(messages))
+    elif output_format in _DOCUMENT_WRITERS:
+        with open(filepath, "w", encoding="utf-8") as f:
+            _DOCUMENT_WRITERS[output_format](messages, f.write)
+    else:
+        raise ValueError(f"Unknown format: {output_format}")
 
     print(f"✓ Agent context saved to {filepath}")
 
 
+def append_agent_message(filepath: str | Path, msg: dict[str, Any]) -> None:
+    """Append a single message to a JSONL history file.
+
+    Unlike save_agent_context, the cost is proportional to the new message
+    rather than to the whole history, so it suits incremental persistence.
+    """
+    filepath = Path(filepath)
+    _ensure_dir(filepath.parent)
+    with open(filepath, "ab") as f:
+        f.write(_json.dumps(msg, newline=True))
+
+
+def load_jsonl_history(filepath: str | Path) -> list[dict[str, Any]]:
+    """Load a history written in the "jsonl" format, one line at a time.
+
+    Histories saved before JSONL are still readable: a ``.json`` file, or the
+    ``.json`` sibling of a ``.jsonl`` path that does not exist, is parsed as a
+    single JSON array.
+    """
+    filepath = Path(filepath)
+    if filepath.suffix == ".jsonl" and not filepath.exists():
+        legacy = filepath.with_suffix(".json")
+        if legacy.exists():
+            filepath = legacy
+    if filepath.suffix == ".json":
+        return _json.loads(filepath.read_bytes())
+    with open(filepath, "rb") as f:
+        return [_json.loads(line) for line in f if line.strip()]
+
+
 def get_context_summary(history: list[dict[str, Any]]) -> dict[str, Any]:
     """
     Get a summary of the agent context.
@@ -202,27 +350,43 @@ def get_context_summary(history: list[dict[str, Any]]) -> dict[str, Any]:
     Returns:
         Dictionary with conversation statistics and metadata
     """
-    user_messages = [m for m in history if m.get("role") == "user"]
-    assistant_messages = [m for m in history if m.get("role") == "assistant"]
-    tool_messages = [m for m in history if m.get("role") == "tool"]
-    system_messages = [m for m in history if m.get("role") == "system"]
-
-    total_tool_calls = sum(len(m.get("tool_calls", [])) for m in assistant_messages)
-
+    # Single pass over the history: role counts, tool usage, token totals and
+    # the character count used for the fallback estimate.
+    role_counts = {"user": 0, "assistant": 0, "tool": 0, "system": 0}
+    total_tool_calls = 0
     tools_used: set[str] = set()
-    for m in assistant_messages:
-        for tc in m.get("tool_calls", []):
-            fn_name = tc.get("function", {}).get("name")
-            if isinstance(fn_name, str) and fn_name:
-                tools_used.add(fn_name)
-
-    # Sum actual prompt_tokens from assistant messages
-    total_prompt_tokens = sum(m.get("prompt_tokens", 0) for m in assistant_messages)
-    total_completion_tokens = sum(m.get("completion_tokens", 0) for m in assistant_messages)
+    total_prompt_tokens = 0
+    total_completion_tokens = 0
+    total_chars = 0
+
+    for m in history:
+        role = m.get("role")
+        if role in role_counts:
+            role_counts[role] += 1
+
+        content = m.get("content")
+        if isinstance(content, str):
+            total_chars += len(content)
+        elif content is not None:
+            total_chars += len(str(content))
+
+        if role == "assistant":
+            # Sum actual prompt_tokens from assistant messages
+            total_prompt_tokens += m.get("prompt_tokens", 0)
+            total_completion_tokens += m.get("completion_tokens", 0)
+
+            tool_calls = m.get("tool_calls")
+            if tool_calls:
+                total_tool_calls += len(tool_calls)
+                for tc in tool_calls:
+                    fn_name = tc.get("function", {}).get("name")
+                    if isinstance(fn_name, str) and fn_name:
+                        tools_used.add(fn_name)
+
     total_tokens = total_prompt_tokens + total_completion_tokens
 
-    # Fall back to estimate if no actual tokens tracked
-    tokens_estimate = _estimate_tokens(history)
+    # Fall back to estimate if no actual tokens tracked (4 chars ≈ 1 token)
+    tokens_estimate = max(1, total_chars // 4)
     using_actual = total_prompt_tokens > 0
 
     # Calculate context window %
@@ -234,10 +398,10 @@ def get_context_summary(history: list[dict[str, Any]]) -> dict[str, Any]:
     return {
         "timestamp": datetime.now().isoformat(),
         "total_messages": len(history),
-        "user_messages": len(user_messages),
-        "assistant_messages": len(assistant_messages),
-        "tool_messages": len(tool_messages),
-        "system_messages": len(system_messages),
+        "user_messages": role_counts["user"],
+        "assistant_messages": role_counts["assistant"],
+        "tool_messages": role_counts["tool"],
+        "system_messages": role_counts["system"],
         "total_tool_calls": total_tool_calls,
         "unique_tools_used": sorted(tools_used),
         "total_prompt_tokens": total_prompt_tokens,
@@ -252,6 +416,27 @@ def get_context_summary(history: list[dict[str, Any]]) -> dict[str, Any]:
     }
 
 
+def _count_lines_and_hash(path: Path, chunk_size: int = 64 * 1024) -> tuple[int, str]:
+    """Return (line count, sha256 hex prefix) of a file in one chunked pass.
+
+    The file is never held in memory as a whole; each chunk feeds both the
+    newline count and the digest. A non-empty file counts one extra line.
+    """
+    digest = hashlib.sha256()
+    newlines = 0
+    total = 0
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+            newlines += chunk.count(b"\n")
+            total += len(chunk)
+    return newlines + (1 if total else 0), digest.hexdigest()[:12]
+
+
+# (path, st_mtime_ns, st_size) -> metadata of the last AGENTS.md that was hashed.
+_agents_md_cache: tuple[tuple[Path, int, int], dict[str, Any]] | None = None
+
+
 def _get_agents_md_metadata() -> dict[str, Any]:
     """Return metadata about AGENTS.md in the current working directory.
 
@@ -275,11 +460,15 @@ def _get_agents_md_metadata() -> dict[str, Any]:
             "error": str(e),
         }
 
+    # Reuse the previous result while the file is unchanged.
+    global _agents_md_cache
+    cache_key = (agents_path, stat.st_mtime_ns, stat.st_size)
+    if _agents_md_cache is not None and _agents_md_cache[0] == cache_key:
+        return dict(_agents_md_cache[1])
+
     # Compute lines + sha256 prefix without returning the file body.
     try:
-        raw = agents_path.read_bytes()
-        lines = raw.count(b"\n") + (1 if raw else 0)
-        sha256 = hashlib.sha256(raw).hexdigest()[:12]
+        lines, sha256 = _count_lines_and_hash(agents_path)
     except OSError as e:
         return {
             "status": "unreadable",
@@ -289,7 +478,7 @@ def _get_agents_md_metadata() -> dict[str, Any]:
             "error": str(e),
         }
 
-    return {
+    metadata: dict[str, Any] = {
         "status": "present",
         "path": str(agents_path),
         "bytes": stat.st_size,
@@ -297,22 +486,22 @@ def _get_agents_md_metadata() -> dict[str, Any]:
         "mtime": datetime.fromtimestamp(stat.st_mtime).isoformat(),
         "sha256": sha256,
     }
+    _agents_md_cache = (cache_key, metadata)
+    return dict(metadata)
 
 
-def _estimate_tokens(history: list[dict[str, Any]]) -> int:
-    """Rough estimate of token count (4 chars ≈ 1 token)."""
-    total_chars = sum(len(str(m.get("content", ""))) for m in history)
-    return max(1, total_chars // 4)
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
 
 
 def _format_size(bytes_val: int) -> str:
     """Format bytes as human-readable string."""
-    size = float(bytes_val)
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size < 1024:
-            return f"{int(size)} {unit}"
-        size /= 1024
-    return f"{size:.1f} TB"
+    if bytes_val < 1024:
+        return f"{int(bytes_val)} B"
+    # Each unit is 2**10 times the previous one, so the bit length picks it directly.
+    exponent = (int(bytes_val).bit_length() - 1) // 10
+    if exponent >= len(_SIZE_UNITS):
+        return f"{bytes_val / 1024**4:.1f} TB"
+    return f"{int(bytes_val / 1024**exponent)} {_SIZE_UNITS[exponent]}"
 
 
 def format_context_summary(history: list[dict[str, Any]]) -> None:
@@ -322,33 +511,39 @@ def format_context_summary(history: list[dict[str, Any]]) -> None:
     The summary always reflects the full history as provided (including system
     messages, if present). Uses rich.Console for colorful output.
     """
-    console = Console()
+    # Imported lazily: only /context renders with rich.
+    from rich.console import Console, Group, RenderableType
+    from rich.text import Text
+
     summary = get_context_summary(history)
 
+    # Collect every line and print them as one Group: a single console write
+    # instead of a lock + flush per line.
+    lines: list[RenderableType] = []
+    add = lines.append
+
     # Header
-    console.print()
-    console.print("[bold cyan]Context summary[/]", justify="center")
-    console.print(f"[dim]{'-' * 80}[/]", justify="center")
+    add("")
+    add(Text.from_markup("[bold cyan]Context summary[/]", justify="center"))
+    add(Text.from_markup(f"[dim]{'-' * 80}[/]", justify="center"))
 
     # Timestamp & basic info
-    console.print()
-    console.print(f"[dim]Timestamp:[/] {summary.get('timestamp', '')}")
-    console.print(f"[dim]Total messages:[/] [cyan]{summary.get('total_messages', 0)}[/cyan]")
+    add("")
+    add(f"[dim]Timestamp:[/] {summary.get('timestamp', '')}")
+    add(f"[dim]Total messages:[/] [cyan]{summary.get('total_messages', 0)}[/cyan]")
 
     # Message breakdown by role
-    console.print()
-    console.print("[blue]By role:[/]")
-    console.print(f"  [dim]system:[/]      [blue]{summary.get('system_messages', 0)}[/blue]")
-    console.print(f"  [dim]user:[/]        [blue]{summary.get('user_messages', 0)}[/blue]")
-    console.print(f"  [dim]assistant:[/]   [blue]{summary.get('assistant_messages', 0)}[/blue]")
-    console.print(f"  [dim]tool:[/]        [blue]{summary.get('tool_messages', 0)}[/blue]")
+    add("")
+    add("[blue]By role:[/]")
+    add(f"  [dim]system:[/]      [blue]{summary.get('system_messages', 0)}[/blue]")
+    add(f"  [dim]user:[/]        [blue]{summary.get('user_messages', 0)}[/blue]")
+    add(f"  [dim]assistant:[/]   [blue]{summary.get('assistant_messages', 0)}[/blue]")
+    add(f"  [dim]tool:[/]        [blue]{summary.get('tool_messages', 0)}[/blue]")
 
     # Tools section
-    console.print()
-    console.print("[green]Tools:[/]")
-    console.print(
-        f"  [dim]Tool calls:[/]       [green]{summary.get('total_tool_calls', 0)}[/green]"
-    )
+    add("")
+    add("[green]Tools:[/]")
+    add(f"  [dim]Tool calls:[/]       [green]{summary.get('total_tool_calls', 0)}[/green]")
 
     tools_raw = summary.get("unique_tools_used")
     tools_list: list[str] = []
@@ -357,28 +552,22 @@ def format_context_summary(history: list[dict[str, Any]]) -> None:
             if isinstance(item, str):
                 tools_list.append(item)
     tools_str = ", ".join(tools_list) if tools_list else "(none)"
-    console.print(f"  [dim]Unique tools used:[/] [green]{tools_str}[/green]")
+    add(f"  [dim]Unique tools used:[/] [green]{tools_str}[/green]")
 
     # Token usage
-    console.print()
-    console.print("[yellow]Token usage:[/]")
+    add("")
+    add("[yellow]Token usage:[/]")
     if summary.get("using_actual_tokens"):
-        console.print(
-            f"  [dim]Prompt:[/]     [yellow]{summary.get('total_prompt_tokens', 0)}[/yellow]"
-        )
-        console.print(
-            f"  [dim]Completion:[/] [yellow]{summary.get('total_completion_tokens', 0)}[/yellow]"
-        )
-        console.print(f"  [dim]Total:[/]      [yellow]{summary.get('total_tokens', 0)}[/yellow]")
+        add(f"  [dim]Prompt:[/]     [yellow]{summary.get('total_prompt_tokens', 0)}[/yellow]")
+        add(f"  [dim]Completion:[/] [yellow]{summary.get('total_completion_tokens', 0)}[/yellow]")
+        add(f"  [dim]Total:[/]      [yellow]{summary.get('total_tokens', 0)}[/yellow]")
     else:
-        console.print(
-            f"  [dim]Estimate:[/] [yellow]{summary.get('total_tokens_estimate', 0)}[/yellow]"
-        )
+        add(f"  [dim]Estimate:[/] [yellow]{summary.get('total_tokens_estimate', 0)}[/yellow]")
 
     # Context window
-    console.print()
-    console.print("[magenta]Context window:[/]")
-    console.print(
+    add("")
+    add("[magenta]Context window:[/]")
+    add(
         f"  [dim]Usage:[/] [magenta]{summary.get('context_window_percent', 0):.1f}%[/magenta] "
         f"[dim]of[/] [magenta]{summary.get('context_window_size', 0):,}[/magenta] "
         f"[dim]({summary.get('model', '')})[/]"
@@ -387,31 +576,33 @@ def format_context_summary(history: list[dict[str, Any]]) -> None:
     # Project instructions (simplified - no mtime, no sha256)
     project_instructions_raw = summary.get("project_instructions")
     if isinstance(project_instructions_raw, dict):
-        console.print()
-        console.print("[bold cyan]Project instructions (AGENTS.md):[/]")
+        add("")
+        add("[bold cyan]Project instructions (AGENTS.md):[/]")
         project_instructions = cast(dict[str, Any], project_instructions_raw)
 
         status = project_instructions.get("status", "unknown")
         path = project_instructions.get("path", "")
         status_str = status if isinstance(status, str) else str(status)
         path_str = path if isinstance(path, str) else str(path)
-        console.print(f"  [dim]Status:[/] [cyan]{status_str}[/cyan]")
-        console.print(f"  [dim]Path:[/]   {path_str}")
+        add(f"  [dim]Status:[/] [cyan]{status_str}[/cyan]")
+        add(f"  [dim]Path:[/]   {path_str}")
 
         # Size in human-readable format
         bytes_val = project_instructions.get("bytes")
         if bytes_val is not None:
             size_str = _format_size(int(bytes_val))
-            console.print(f"  [dim]Size:[/]   {size_str}")
+            add(f"  [dim]Size:[/]   {size_str}")
 
         # Line count
         if "lines" in project_instructions:
-            console.print(f"  [dim]Lines:[/]  {project_instructions.get('lines')}")
+            add(f"  [dim]Lines:[/]  {project_instructions.get('lines')}")
 
         # Error message if unreadable
         if "error" in project_instructions:
-            console.print(f"  [dim]Error:[/]  {project_instructions.get('error')}")
+            add(f"  [dim]Error:[/]  {project_instructions.get('error')}")
 
     # Footer
-    console.print(f"[dim]{'-' * 80}[/]", justify="center")
-    console.print()
+    add(Text.from_markup(f"[dim]{'-' * 80}[/]", justify="center"))
+    add("")
+
+    Console().print(Group(*lines))
@@ -6,21 +6,23 @@ Configuration via .meto/hooks.yaml.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import re
+import signal
 import subprocess
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal
+from typing import IO, Any, Literal, get_args
 
-import yaml
-from pydantic import BaseModel, Field, field_validator
-
-from meto.agent.shell import pick_shell_runner
+from meto.agent import _json
+from meto.agent.shell import pick_shell_runner, split_command
 from meto.conf import settings
 
 logger = logging.getLogger("hooks")
@@ -32,46 +34,113 @@ EXIT_BLOCK = 2
 # Default timeout for hook execution (seconds)
 DEFAULT_HOOK_TIMEOUT = 60
 
+# Upper bound on hooks run in parallel for events that do not block
+MAX_CONCURRENT_HOOKS = 8
+
+# Upper bound on stdout/stderr kept from a single hook run (bytes, per stream)
+HOOK_OUTPUT_LIMIT = 1 << 20
+
 HookEvent = Literal["pre_tool_use", "post_tool_use", "session_start"]
 
+# Valid hook names: alphanumeric, dash, or underscore (matched with fullmatch).
+_HOOK_NAME_RE = re.compile(r"[a-zA-Z0-9_-]+")
+
+_HOOK_EVENTS: frozenset[str] = frozenset(get_args(HookEvent))
+_HOOK_CONFIG_FIELDS = ("name", "event", "tools", "command", "timeout")
 
-class HookConfig(BaseModel):
+
+@dataclass(slots=True, kw_only=True)
+class HookConfig:
     """Configuration for a single hook."""
 
     name: str
     event: HookEvent
-    tools: list[str] = Field(default_factory=list)  # Empty = all tools
+    tools: list[str] = field(default_factory=list)  # Empty = all tools
     command: str
     timeout: int = DEFAULT_HOOK_TIMEOUT
 
-    @field_validator("name")
-    @classmethod
-    def validate_name(cls, v: str) -> str:
-        if not re.match(r"^[a-zA-Z0-9_-]+$", v):
+    def __post_init__(self) -> None:
+        if not isinstance(self.name, str) or not _HOOK_NAME_RE.fullmatch(self.name):
             raise ValueError("Hook name must be alphanumeric, dash, or underscore")
-        return v
+        if self.event not in _HOOK_EVENTS:
+            raise ValueError(f"Hook event must be one of: {', '.join(sorted(_HOOK_EVENTS))}")
+        if not isinstance(self.command, str):
+            raise ValueError("Hook command must be a string")
+        if not isinstance(self.tools, list) or not all(isinstance(t, str) for t in self.tools):
+            raise ValueError("Hook tools must be a list of strings")
+        # Coerce like the old pydantic model's lax mode: "30" and 2.0 pass, 2.5 does not.
+        try:
+            timeout = int(self.timeout)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("Hook timeout must be an integer") from None
+        if isinstance(self.timeout, bool) or (
+            isinstance(self.timeout, float) and timeout != self.timeout
+        ):
+            raise ValueError("Hook timeout must be an integer")
+        self.timeout = timeout
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HookConfig:
+        """Build a hook from a parsed YAML mapping, ignoring unknown keys."""
+        missing = [key for key in ("name", "event", "command") if key not in data]
+        if missing:
+            raise ValueError(f"Hook is missing required fields: {', '.join(missing)}")
+        return cls(**{key: data[key] for key in _HOOK_CONFIG_FIELDS if key in data})
 
 
-class HooksConfig(BaseModel):
+@dataclass(slots=True)
+class HooksConfig:
     """Root configuration containing all hooks."""
 
-    hooks: list[HookConfig] = Field(default_factory=list)
+    hooks: list[HookConfig] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HooksConfig:
+        """Build the config from a parsed YAML mapping."""
+        raw_hooks = data.get("hooks") or []
+        if not isinstance(raw_hooks, list):
+            raise ValueError("'hooks' must be a list")
+        return cls(hooks=[HookConfig.from_dict(raw) for raw in raw_hooks])
 
     @classmethod
     def load_from_yaml(cls, path: Path) -> HooksConfig:
-        """Load hooks config from YAML file."""
-        if not path.exists():
+        """Load hooks config from YAML file.
+
+        The parsed config is cached until the file's mtime, size or inode
+        changes; the returned object is shared and must be treated as read-only.
+        """
+        global _hooks_config_cache
+        try:
+            stat = path.stat()
+        except OSError:
             return cls()
+
+        cache_key = (path, stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        if _hooks_config_cache is not None and _hooks_config_cache[0] == cache_key:
+            return _hooks_config_cache[1]
+
+        # Imported lazily: most sessions have no hooks file to parse.
+        import yaml
+
         try:
             content = path.read_text(encoding="utf-8")
-            data = yaml.safe_load(content) or {}
-            return cls(**data)
+            # Prefer the LibYAML-backed C loader when PyYAML was built with it.
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            data = yaml.load(content, Loader=loader) or {}
+            config = cls.from_dict(data)
         except Exception as e:
             logger.warning(f"Failed to load hooks config from {path}: {e}")
-            return cls()
+            config = cls()
+
+        _hooks_config_cache = (cache_key, config)
+        return config
+
 
+# Last parsed hooks file, keyed by (path, st_mtime_ns, st_size, st_ino).
+_hooks_config_cache: tuple[tuple[Path, int, int, int], HooksConfig] | None = None
 
-@dataclass
+
+@dataclass(slots=True)
 class HookResult:
     """Result from hook execution."""
 
@@ -84,7 +153,7 @@ class HookResult:
     stderr: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class HookInput:
     """Input data passed to hook via HOOK_INPUT_JSON env var."""
 
@@ -96,6 +165,7 @@ class HookInput:
     result: str | None = None
 
     def to_json(self) -> str:
+        """Serialize as compact JSON (no spaces after separators, non-ASCII escaped)."""
         data: dict[str, Any] = {"event": self.event, "session_id": self.session_id}
         if self.tool is not None:
             data["tool"] = self.tool
@@ -105,7 +175,99 @@ class HookInput:
             data["params"] = self.params
         if self.result is not None:
             data["result"] = self.result
-        return json.dumps(data)
+        return _json.dumps(data, ensure_ascii=True).decode("ascii")
+
+
+class _CappedPipe:
+    """Drain a pipe on a background thread, keeping at most HOOK_OUTPUT_LIMIT bytes.
+
+    Output past the limit is read and discarded, so a chatty hook can neither grow
+    memory without bound nor stall on a full pipe.
+    """
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self._chunks: list[bytes] = []
+        self._kept = 0
+        self.truncated = False
+        self._thread = threading.Thread(target=self._drain, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _drain(self, stream: IO[bytes]) -> None:
+        with stream:
+            # os.read returns whatever is available, so output written before a
+            # lingering child keeps the pipe open is still captured.
+            fd = stream.fileno()
+            while chunk := os.read(fd, 65536):
+                room = HOOK_OUTPUT_LIMIT - self._kept
+                if len(chunk) > room:
+                    chunk = chunk[:room]
+                    self.truncated = True
+                if chunk:
+                    self._chunks.append(chunk)
+                    self._kept += len(chunk)
+
+    def text(self, timeout: float) -> str:
+        """Wait up to timeout seconds for EOF and return the output captured so far.
+
+        A process that outlives the hook (e.g. a backgrounded child) can keep the pipe
+        open indefinitely, so the wait is bounded; its later output is dropped.
+        """
+        self._thread.join(timeout)
+        text = b"".join(list(self._chunks)).decode("utf-8", errors="replace")
+        # Universal newlines, as subprocess's text mode applied before.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if self.truncated:
+            text += f"\n... (truncated to {HOOK_OUTPUT_LIMIT} bytes)"
+        return text
+
+
+# How long to wait for the pipes to close after a timed-out hook was killed.
+_KILL_GRACE_SECONDS = 1.0
+
+
+def _kill_process_group(proc: subprocess.Popen[bytes]) -> None:
+    """Kill a hook process together with any children it started."""
+    if os.name == "posix":
+        try:
+            # The hook runs in its own session, so its pid is also the group id.
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+
+
+def _run_captured(
+    argv: list[str], env: dict[str, str], timeout: int, cwd: Path
+) -> subprocess.CompletedProcess[str]:
+    """Run a hook process like ``subprocess.run(capture_output=True, text=True)``.
+
+    Unlike ``subprocess.run``, captured stdout/stderr are capped at HOOK_OUTPUT_LIMIT.
+    On timeout the whole process group is killed, and the call never waits on the
+    pipes past the timeout (plus a short grace period after a kill).
+    """
+    deadline = time.monotonic() + timeout
+    proc = subprocess.Popen(
+        argv,
+        env=env,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        start_new_session=os.name == "posix",
+    )
+    assert proc.stdout is not None and proc.stderr is not None
+    stdout, stderr = _CappedPipe(proc.stdout), _CappedPipe(proc.stderr)
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(proc)
+        proc.wait()
+        deadline = time.monotonic() + _KILL_GRACE_SECONDS
+        raise
+    finally:
+        out_text = stdout.text(max(deadline - time.monotonic(), 0))
+        err_text = stderr.text(max(deadline - time.monotonic(), 0))
+    return subprocess.CompletedProcess(argv, returncode, out_text, err_text)
 
 
 def is_python_script(command: str) -> bool:
@@ -141,38 +303,9 @@ def run_python_script(
     if not sys.executable:
         raise RuntimeError("sys.executable not available - cannot run Python script")
 
-    # Parse command into script path and arguments
-    # Use a simple parser that handles quoted arguments properly
-    # Don't use shlex.split() as it mishandles Windows paths with backslashes
-    parts = []
-    current = []
-    in_quote = False
-    quote_char = None
-
-    i = 0
-    while i < len(command):
-        c = command[i]
-
-        if in_quote:
-            if c == quote_char:
-                in_quote = False
-                quote_char = None
-            else:
-                current.append(c)
-        elif c in ('"', "'"):
-            in_quote = True
-            quote_char = c
-        elif c.isspace():
-            if current:
-                parts.append("".join(current))
-                current = []
-        else:
-            current.append(c)
-
-        i += 1
-
-    if current:
-        parts.append("".join(current))
+    # Parse command into script path and arguments. split_command keeps
+    # backslashes literally, so Windows paths are not mangled.
+    parts = split_command(command)
 
     if not parts:
         raise ValueError("Empty command")
@@ -182,29 +315,29 @@ def run_python_script(
 
     argv = [sys.executable, script_path] + args
 
-    return subprocess.run(
-        argv,
-        env=env,
-        capture_output=True,
-        text=True,
-        timeout=timeout,
-        cwd=cwd,
-    )
+    return _run_captured(argv, env=env, timeout=timeout, cwd=cwd)
 
 
-@dataclass
+@dataclass(slots=True)
 class HooksManager:
     """Manages hook loading and execution."""
 
     config: HooksConfig
-    _hooks_by_event: dict[HookEvent, list[HookConfig]] = field(default_factory=dict)
+    _hooks_by_event: dict[HookEvent, tuple[HookConfig, ...]] = field(default_factory=dict)
+    # (event, tool name) -> matching hooks; the set of tool names is small and fixed.
+    _hooks_by_tool: dict[tuple[HookEvent, str], tuple[HookConfig, ...]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Snapshot of os.environ taken on first use; reset_hooks_manager_cache() refreshes it.
+    _base_env: dict[str, str] | None = field(default=None, init=False, repr=False)
 
     def __post_init__(self) -> None:
-        # Index hooks by event for fast lookup
+        # Index hooks by event for fast lookup. Tuples are immutable, so lookups
+        # can hand them out without copying.
+        buckets: defaultdict[HookEvent, list[HookConfig]] = defaultdict(list)
         for hook in self.config.hooks:
-            if hook.event not in self._hooks_by_event:
-                self._hooks_by_event[hook.event] = []
-            self._hooks_by_event[hook.event].append(hook)
+            buckets[hook.event].append(hook)
+        self._hooks_by_event = {event: tuple(hooks) for event, hooks in buckets.items()}
 
     @classmethod
     def load(cls, hooks_path: Path) -> HooksManager:
@@ -214,13 +347,19 @@ class HooksManager:
 
     def get_hooks_for_event(
         self, event: HookEvent, tool_name: str | None = None
-    ) -> list[HookConfig]:
+    ) -> tuple[HookConfig, ...]:
         """Get hooks matching event and optionally tool name."""
-        hooks = self._hooks_by_event.get(event, [])
-        if tool_name is None:
+        hooks = self._hooks_by_event.get(event, ())
+        if tool_name is None or not hooks:
             return hooks
-        # Filter by tool name if specified
-        return [h for h in hooks if not h.tools or tool_name in h.tools]
+
+        # Filter by tool name if specified; the result only depends on the key.
+        key = (event, tool_name)
+        matching = self._hooks_by_tool.get(key)
+        if matching is None:
+            matching = tuple(h for h in hooks if not h.tools or tool_name in h.tools)
+            self._hooks_by_tool[key] = matching
+        return matching
 
     def run_hooks(
         self,
@@ -235,6 +374,10 @@ class HooksManager:
 
         Returns list of HookResult. For pre_tool_use, check if any result.blocked is True.
         """
+        # Fast path for the common case of no hooks configured at all.
+        if not self._hooks_by_event:
+            return []
+
         hooks = self.get_hooks_for_event(event, tool)
         if not hooks:
             return []
@@ -248,20 +391,46 @@ class HooksManager:
             result=result,
         )
 
+        # Every hook for this event sees the same input, so serialize it and
+        # copy the environment once rather than once per hook.
+        try:
+            env: dict[str, str] | None = self._build_env(hook_input)
+        except (TypeError, ValueError):
+            env = None  # _run_hook retries and reports the error per hook
+
+        if event != "pre_tool_use" and len(hooks) > 1 and settings.HOOKS_PARALLEL:
+            # Only pre_tool_use needs ordered, stop-on-block execution. Other
+            # events run their hooks concurrently; each thread just waits on
+            # its subprocess, so total latency is the slowest hook, not the sum.
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_HOOKS, len(hooks))) as pool:
+                return list(pool.map(lambda hook: self._run_hook(hook, hook_input, env), hooks))
+
         results: list[HookResult] = []
         for hook in hooks:
-            result_obj = self._run_hook(hook, hook_input)
+            result_obj = self._run_hook(hook, hook_input, env)
             results.append(result_obj)
             # For pre_tool_use, stop on first block
             if event == "pre_tool_use" and result_obj.blocked:
                 break
         return results
 
-    def _run_hook(self, hook: HookConfig, hook_input: HookInput) -> HookResult:
+    def _build_env(self, hook_input: HookInput) -> dict[str, str]:
+        """Return the hook environment: the process environment plus HOOK_INPUT_JSON.
+
+        Copying os.environ decodes every entry in Python, so it is done once per
+        manager and later merged with a plain dict copy.
+        """
+        if self._base_env is None:
+            self._base_env = os.environ.copy()
+        return self._base_env | {"HOOK_INPUT_JSON": hook_input.to_json()}
+
+    def _run_hook(
+        self, hook: HookConfig, hook_input: HookInput, env: dict[str, str] | None = None
+    ) -> HookResult:
         """Execute a single hook command."""
         try:
-            env = os.environ.copy()
-            env["HOOK_INPUT_JSON"] = hook_input.to_json()
+            if env is None:
+                env = self._build_env(hook_input)
 
             # Try to run Python scripts directly with sys.executable
             if is_python_script(hook.command):
@@ -301,13 +470,8 @@ class HooksManager:
                     error="No shell runner available",
                 )
 
-            proc = subprocess.run(
-                [*runner, hook.command],
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=hook.timeout,
-                cwd=Path.cwd(),
+            proc = _run_captured(
+                [*runner, hook.command], env=env, timeout=hook.timeout, cwd=Path.cwd()
             )
 
             blocked = hook_input.event == "pre_tool_use" and proc.returncode == EXIT_BLOCK
@@ -356,7 +520,8 @@ def get_hooks_manager() -> HooksManager:
 def reset_hooks_manager_cache() -> None:
     """Clear the cached hooks manager.
 
-    Primarily used in tests or when the hooks file is modified during runtime.
+    Primarily used in tests or when the hooks file or the environment hooks
+    should see is modified during runtime.
     """
 
     get_hooks_manager.cache_clear()
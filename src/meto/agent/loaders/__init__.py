@@ -10,7 +10,7 @@ from meto.agent.loaders.agent_loader import (
     parse_agent_file,
     validate_agent_config,
 )
-from meto.agent.loaders.frontmatter import parse_yaml_frontmatter
+from meto.agent.loaders.frontmatter import parse_yaml_frontmatter, parse_yaml_frontmatter_bytes
 from meto.agent.loaders.skill_loader import (
     SkillConfig,
     SkillLoader,
@@ -37,4 +37,5 @@ __all__ = [
     "clear_skill_cache",
     # Frontmatter parsing
     "parse_yaml_frontmatter",
+    "parse_yaml_frontmatter_bytes",
 ]
@@ -15,7 +15,7 @@ from pathlib import Path
 from typing import Any, TypedDict
 
 from meto.agent.exceptions import ToolNotFoundError
-from meto.agent.loaders.frontmatter import parse_yaml_frontmatter
+from meto.agent.loaders.frontmatter import parse_yaml_frontmatter_bytes
 from meto.agent.tool_schema import TOOLS, TOOLS_BY_NAME
 from meto.conf import settings
 
@@ -159,8 +159,8 @@ def parse_agent_file(path: Path) -> AgentConfig | None:
         AgentConfig if valid, None if parsing failed (error logged)
     """
     try:
-        content = path.read_text(encoding="utf-8")
-        parsed = parse_yaml_frontmatter(content)
+        content = path.read_bytes()
+        parsed = parse_yaml_frontmatter_bytes(content)
 
         metadata = parsed["metadata"]
         body = parsed["body"]
@@ -220,7 +220,9 @@ class AgentLoader:
             Dict mapping agent names to AgentConfig
         """
         if not self.agents_dir.exists():
-            logger.debug(f"Agents directory {self.agents_dir} does not exist, skipping user agents")
+            logger.debug(
+                "Agents directory %s does not exist, skipping user agents", self.agents_dir
+            )
             return {}
 
         if not self.agents_dir.is_dir():
@@ -235,7 +237,7 @@ class AgentLoader:
                 if agent_config:
                     name = path.stem
                     agents[name] = agent_config
-                    logger.debug(f"Loaded user agent '{name}' from {path}")
+                    logger.debug("Loaded user agent '%s' from %s", name, path)
 
         return agents
 
@@ -10,9 +10,17 @@ from typing import Any
 
 import yaml
 
+# Prefer the LibYAML-backed C loader; fall back to the pure-Python one when
+# PyYAML was built without LibYAML.
+_YAML_SAFE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Regex to match YAML frontmatter between --- delimiters
 FRONTMATTER_PATTERN = re.compile(r"^---\n(.*?)\n---\n(.*)$", re.DOTALL)
 
+# Same pattern for raw file bytes. Files read as bytes skip universal-newline
+# translation, so CRLF delimiters are accepted here as well.
+FRONTMATTER_PATTERN_BYTES = re.compile(rb"^---\r?\n(.*?)\r?\n---\r?\n(.*)$", re.DOTALL)
+
 
 def parse_yaml_frontmatter(content: str) -> dict[str, Any]:
     """Parse YAML frontmatter from markdown content.
@@ -26,8 +34,43 @@ def parse_yaml_frontmatter(content: str) -> dict[str, Any]:
     match = FRONTMATTER_PATTERN.match(content)
     if match:
         yaml_block, body = match.groups()
-        metadata = yaml.safe_load(yaml_block) or {}
+        metadata = yaml.load(yaml_block, Loader=_YAML_SAFE_LOADER) or {}
         return {"metadata": metadata, "body": body.strip()}
     else:
         # No frontmatter found, treat entire content as body
         return {"metadata": {}, "body": content.strip()}
+
+
+def _decode_text(raw: bytes) -> str:
+    """Decode UTF-8 bytes with the same newline handling as ``Path.read_text``."""
+    text = raw.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def parse_yaml_frontmatter_bytes(content: bytes, *, include_body: bool = True) -> dict[str, Any]:
+    """Parse YAML frontmatter from raw markdown file bytes.
+
+    Only the frontmatter block is decoded for YAML parsing. The body is decoded
+    only when ``include_body`` is True; metadata-only callers (e.g. skill
+    discovery) get an empty body and skip decoding the rest of the file.
+
+    Args:
+        content: Full file content as read by ``Path.read_bytes()``
+        include_body: Whether to decode and return the markdown body
+
+    Returns:
+        Dict with 'metadata' (parsed YAML) and 'body' (remaining content)
+
+    Raises:
+        UnicodeDecodeError: If a decoded part is not valid UTF-8
+    """
+    match = FRONTMATTER_PATTERN_BYTES.match(content)
+    if match:
+        yaml_block, body = match.groups()
+        metadata = yaml.load(_decode_text(yaml_block), Loader=_YAML_SAFE_LOADER) or {}
+        return {"metadata": metadata, "body": _decode_text(body).strip() if include_body else ""}
+    else:
+        # No frontmatter found, treat entire content as body
+        return {"metadata": {}, "body": _decode_text(content).strip() if include_body else ""}
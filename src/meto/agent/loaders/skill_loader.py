@@ -11,7 +11,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any, TypedDict
 
-from meto.agent.loaders.frontmatter import parse_yaml_frontmatter
+from meto.agent.loaders.frontmatter import parse_yaml_frontmatter_bytes
 from meto.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -81,7 +81,7 @@ class SkillLoader:
     def _discover_skills(self) -> None:
         """Scan skills directory for SKILL.md files."""
         if not self.skills_dir.exists():
-            logger.debug(f"Skills directory {self.skills_dir} does not exist, no skills loaded")
+            logger.debug("Skills directory %s does not exist, no skills loaded", self.skills_dir)
             return
 
         if not self.skills_dir.is_dir():
@@ -99,8 +99,8 @@ class SkillLoader:
 
             try:
                 # Parse metadata only (lazy loading)
-                content = skill_file.read_text(encoding="utf-8")
-                parsed = parse_yaml_frontmatter(content)
+                content = skill_file.read_bytes()
+                parsed = parse_yaml_frontmatter_bytes(content, include_body=False)
                 metadata: dict[str, Any] = parsed["metadata"]  # type: ignore[assignment]
 
                 # Get name from frontmatter or directory name
@@ -120,7 +120,7 @@ class SkillLoader:
                     "description": description,
                     "path": skill_file,
                 }
-                logger.debug(f"Discovered skill '{name}' at {skill_file}")
+                logger.debug("Discovered skill '%s' at %s", name, skill_file)
 
             except Exception as e:
                 logger.warning(f"Failed to parse skill file {skill_file}: {e}")
@@ -162,8 +162,8 @@ class SkillLoader:
 
         try:
             # Read full file content
-            content = skill_path.read_text(encoding="utf-8")
-            parsed = parse_yaml_frontmatter(content)
+            content = skill_path.read_bytes()
+            parsed = parse_yaml_frontmatter_bytes(content)
             body = parsed["body"]
 
             # Check for additional resources in skill directory
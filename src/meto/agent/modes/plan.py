@@ -9,7 +9,7 @@ and UX feature. Permissions are handled separately by `permission_policy`.
 
 from __future__ import annotations
 
-import random
+import secrets
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import override
@@ -22,7 +22,7 @@ def _generate_plan_filename(now: datetime | None = None) -> str:
     """Generate a unique plan filename."""
 
     ts = (now or datetime.now(tz=UTC)).strftime("%Y%m%d_%H%M%S")
-    suffix = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=6))
+    suffix = secrets.token_hex(3)
     return f"plan-{ts}-{suffix}.md"
 
 
@@ -9,6 +9,7 @@ outside known meto directories, we require permission (fail closed).
 
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import Any, override
@@ -58,18 +59,37 @@ class NeverRequirePermissionCheck(PermissionCheck):
 class ExternalPathPermissionCheck(PermissionCheck):
     """Prompt when a path argument points outside known meto directories."""
 
+    def __init__(self) -> None:
+        self._allowed_dirs_key: tuple[object, ...] | None = None
+        self._allowed_dirs: list[Path] = []
+        # normcase'd string forms of _allowed_dirs, each ending with a separator.
+        self._allowed_prefixes: tuple[str, ...] = ()
+
     @property
     def allowed_dirs(self) -> list[Path]:
         """Directories that are considered safe to operate in without prompting."""
+        self._refresh_allowed_dirs()
+        return self._allowed_dirs
+
+    def _refresh_allowed_dirs(self) -> None:
         # Keep this list tight: file system tools should not silently operate on
         # paths outside known meto areas.
-        return [
-            Path.cwd().resolve(),
-            settings.PLAN_DIR.resolve(),
-            settings.AGENTS_DIR.resolve(),
-            settings.COMMANDS_DIR.resolve(),
-            settings.SKILLS_DIR.resolve(),
-        ]
+        key = (
+            os.getcwd(),
+            settings.PLAN_DIR,
+            settings.AGENTS_DIR,
+            settings.COMMANDS_DIR,
+            settings.SKILLS_DIR,
+        )
+        # resolve() stats every path component, so only redo it when cwd or one of
+        # the configured directories changes.
+        if key != self._allowed_dirs_key:
+            cwd, *dirs = key
+            self._allowed_dirs = [Path(cwd).resolve(), *(Path(d).resolve() for d in dirs)]
+            self._allowed_prefixes = tuple(
+                os.path.join(os.path.normcase(d), "") for d in self._allowed_dirs
+            )
+            self._allowed_dirs_key = key
 
     @override
     def is_required(self, args: dict[str, Any]) -> bool:
@@ -84,14 +104,13 @@ class ExternalPathPermissionCheck(PermissionCheck):
             return False
 
         try:
-            target_path = Path(path).expanduser().resolve()
-            for allowed_dir in self.allowed_dirs:
-                try:
-                    target_path.relative_to(allowed_dir)
-                    return False  # Path is inside an allowed directory
-                except ValueError:
-                    continue
-            return True  # Path is outside all allowed directories
+            # Compare canonical strings; a trailing separator on both sides makes the
+            # prefix test equivalent to Path.relative_to() without raising per miss.
+            target = os.path.realpath(os.path.expanduser(path))
+            target = os.path.join(os.path.normcase(target), "")
+            self._refresh_allowed_dirs()
+            # Inside an allowed directory -> no prompt; outside all of them -> prompt.
+            return not target.startswith(self._allowed_prefixes)
         except Exception:
             return True  # Fail closed: require permission if we cannot validate
 
@@ -7,13 +7,19 @@ The agent uses two logging surfaces:
 This module keeps the logging concerns isolated from the agent loop/tool runner.
 """
 
-import json
+import atexit
 import logging
-from datetime import UTC, datetime
+import queue
+import re
+import threading
+from collections.abc import Sequence
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Any, override
 
 from rich.console import Console
 
+from meto.agent import _json
 from meto.agent.hooks import HookResult
 from meto.conf import settings
 
@@ -22,29 +28,74 @@ logger.setLevel(logging.INFO)
 logger.propagate = False
 
 
+# Finds the first non-whitespace character (used to detect a mode fragment).
+_NON_SPACE = re.compile(r"\S")
+
+
 class JSONFormatter(logging.Formatter):
     """Format log records as a single-line JSON object."""
 
     @override
     def format(self, record: logging.LogRecord) -> str:
+        # Context passed via ``extra=`` lands in the record's __dict__; one dict lookup
+        # each is cheaper than getattr with a default.
+        fields = record.__dict__
         log_obj = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
+            "timestamp": _json.iso_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
-            "session_id": getattr(record, "session_id", None),
-            "agent_name": getattr(record, "agent_name", None),
-            "agent_run_id": getattr(record, "agent_run_id", None),
-            "turn": getattr(record, "turn", None),
+            "session_id": fields.get("session_id"),
+            "agent_name": fields.get("agent_name"),
+            "agent_run_id": fields.get("agent_run_id"),
+            "turn": fields.get("turn"),
         }
 
         # Merge hook data if present - hook fields should be at top level
-        hook_data = getattr(record, "hook", None)
+        hook_data = fields.get("hook")
         if hook_data:
             log_obj.update(hook_data)
             log_obj["type"] = "hook"
 
-        return json.dumps(log_obj)
+        return _json.dumps(log_obj).decode()
+
+
+class _SinkHandler(logging.Handler):
+    """Hand each queued record to the file handler of the logger that emitted it."""
+
+    @override
+    def emit(self, record: logging.LogRecord) -> None:
+        sink = record.__dict__.get("sink")
+        if sink is not None:
+            sink.handle(record)
+
+
+# One queue and writer thread shared by every ReasoningLogger, so formatting and
+# file writes never block the agent loop. Records carry their file handler ("sink").
+_log_queue: queue.Queue[logging.LogRecord] = queue.Queue()
+_listener: QueueListener | None = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener() -> None:
+    """Start the shared writer thread if it is not running."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = QueueListener(_log_queue, _SinkHandler())
+            _listener.start()
+
+
+def _stop_listener() -> None:
+    """Write out every queued record and stop the shared writer thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 class ReasoningLogger:
@@ -58,6 +109,7 @@ class ReasoningLogger:
 
     _logger: logging.Logger
     _json_handler: logging.FileHandler | None
+    _streaming: bool
 
     def __init__(self, session_id: str, agent_name: str, agent_run_id: str | None = None) -> None:
         self.session_id = session_id
@@ -65,42 +117,39 @@ class ReasoningLogger:
         self.agent_run_id = agent_run_id or str(datetime.now().timestamp())
         self.turn_count = 0
         self.console = Console(stderr=True)
+        self._streaming = False
 
-        # Instance-specific logger to avoid accumulating handlers on a module-global logger.
-        self._logger = logging.getLogger(
-            f"meto.agent.reasoning.{self.session_id}.{self.agent_run_id}"
+        # Instance-specific logger that is deliberately not registered with the logging
+        # manager: getLogger() would keep one logger per run alive forever and hand back
+        # a previous run's handlers whenever a name is reused.
+        self._logger = logging.Logger(
+            f"meto.agent.reasoning.{self.session_id}.{self.agent_run_id}", logging.INFO
         )
-        self._logger.setLevel(logging.INFO)
         self._logger.propagate = False
 
-        # Ensure we never duplicate handlers even if the same logger name is reused.
-        for h in list(self._logger.handlers):
-            try:
-                h.close()
-            finally:
-                self._logger.removeHandler(h)
-
-        self._json_handler = None
-
-        # JSON file handler
+        # Records go through the shared queue; the writer thread hands them back to
+        # this logger's JSON file handler.
         json_handler = logging.FileHandler(settings.log_file, encoding="utf-8")
         json_handler.setFormatter(JSONFormatter())
-        self._logger.addHandler(json_handler)
         self._json_handler = json_handler
+        _start_listener()
+        self._logger.addHandler(QueueHandler(_log_queue))
 
     def close(self) -> None:
-        """Close any file handlers attached to this logger.
+        """Write out pending records and close the file handler of this logger.
 
         In interactive usage, ReasoningLogger instances are created frequently.
         Explicitly closing handlers prevents file descriptor leaks and duplicate logs.
         """
 
         for h in list(self._logger.handlers):
-            try:
-                h.close()
-            finally:
-                self._logger.removeHandler(h)
-        self._json_handler = None
+            self._logger.removeHandler(h)
+        if self._json_handler is not None:
+            if _listener is not None:
+                # Wait until the writer thread has handled everything queued so far.
+                _log_queue.join()
+            self._json_handler.close()
+            self._json_handler = None
 
     def _log(self, level: int, msg: str, **kwargs: Any) -> None:
         """Internal log method that adds session context."""
@@ -108,6 +157,7 @@ class ReasoningLogger:
             "session_id": self.session_id,
             "agent_name": self.agent_name,
             "agent_run_id": self.agent_run_id,
+            "sink": self._json_handler,
             **kwargs,
         }
         self._logger.log(level, msg, extra=extra)
@@ -119,7 +169,7 @@ class ReasoningLogger:
 
     def log_api_request(self, messages: list[dict[str, Any]]) -> None:
         """Log the messages being sent to the model."""
-        self._logger.debug(f"[{self.session_id}] API request with {len(messages)} messages")
+        self._logger.debug("[%s] API request with %d messages", self.session_id, len(messages))
 
     def log_model_response(self, response: Any, _model: str) -> None:
         """Log the raw model response."""
@@ -127,46 +177,59 @@ class ReasoningLogger:
 
         msg = response.choices[0].message
         assistant_content = msg.content or ""
-        tool_calls: list[Any] = list(getattr(msg, "tool_calls", None) or [])
+        tool_calls: Sequence[Any] = getattr(msg, "tool_calls", None) or ()
 
         self._log(logging.INFO, f"Turn {self.turn_count}: Model response", turn=self.turn_count)
 
-        if assistant_content:
+        if self._streaming:
+            # The content was already echoed by log_content_delta(); end its line.
+            self.console.print()
+            self._streaming = False
+            if assistant_content:
+                self._log(logging.INFO, f"Assistant reasoning: {assistant_content}")
+        elif assistant_content:
             self._log(logging.INFO, f"Assistant reasoning: {assistant_content}")
             self.console.print(f"[bold]Turn {self.turn_count}:[/] {assistant_content}")
 
         self._log(logging.INFO, f"Tool calls requested: {len(tool_calls)}")
 
-        # Log token usage if available
-        if hasattr(response, "usage"):
+        # Log token usage if available (streamed responses may not report it)
+        usage = getattr(response, "usage", None)
+        if usage:
             self._log(
                 logging.INFO,
-                f"Token usage - Input: {response.usage.prompt_tokens}, "
-                f"Output: {response.usage.completion_tokens}",
+                f"Token usage - Input: {usage.prompt_tokens}, Output: {usage.completion_tokens}",
             )
             # Also print to console for user visibility
             self.console.print(
-                f"[dim]📊 Tokens: {response.usage.prompt_tokens} ↗️, "
-                f"{response.usage.completion_tokens} ↘️[/]"
+                f"[dim]📊 Tokens: {usage.prompt_tokens} ↗️, {usage.completion_tokens} ↘️[/]"
             )
 
+    def log_content_delta(self, delta: str) -> None:
+        """Echo a streamed fragment of assistant content as it arrives."""
+        if not self._streaming:
+            self.console.print(f"[bold]Turn {self.turn_count + 1}:[/] ", end="")
+            self._streaming = True
+        self.console.print(delta, end="", markup=False, highlight=False)
+
     def log_tool_selection(self, tool_name: str, arguments: dict[str, Any]) -> None:
         """Log when the model selects a tool."""
-        self._log(
-            logging.INFO,
-            f"Tool selected: {tool_name} with args: {json.dumps(arguments, indent=2)}",
-        )
-        args_preview = json.dumps(arguments, ensure_ascii=False)[:100]
-        self.console.print(f"[dim]🔧 {tool_name} {args_preview}...[/]")
+        # One serialization serves both the trace file and the console preview.
+        args_json = _json.dumps(arguments).decode()
+        if self._logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, f"Tool selected: {tool_name} with args: {args_json}")
+        self.console.print(f"[dim]🔧 {tool_name} {args_json[:100]}...[/]")
 
     def log_tool_execution(self, tool_name: str, result: str, error: bool = False) -> None:
         """Log tool execution results."""
         level = logging.ERROR if error else logging.INFO
-        truncated = result[:200] + "..." if len(result) > 200 else result
-        self._log(level, f"Tool '{tool_name}' result: {truncated}")
+        # The trace file keeps the full result (tool output is already capped at
+        # MAX_TOOL_OUTPUT_CHARS); only the console line is shortened.
+        self._log(level, f"Tool '{tool_name}' result: {result}")
 
         if error:
-            self.console.print(f"[red]✗ {tool_name}:[/] {truncated}")
+            preview = result if len(result) <= 200 else result[:200] + "..."
+            self.console.print(f"[red]✗ {tool_name}:[/] {preview}")
         else:
             self.console.print(f"[green]✓ {tool_name}[/]")
 
@@ -260,49 +323,22 @@ class ReasoningLogger:
         """Log the system prompt being sent to the model."""
         self._log(logging.INFO, f"System prompt: {prompt[:500]}...")
         if settings.LOG_SYSTEM_PROMPT:
-            # Detect which sections are present
+            # Sections appear in this order:
+            # base -> agent instructions -> AGENTS.md -> skills -> mode fragment
             sections = ["base prompt"]
-
-            if "Available skills:" in prompt:
-                sections.append("skills")
-
-            # Check for agent instructions (comes before mode in string, but added after)
-            # The order in build_system_prompt: base -> mode -> agent instructions -> AGENTS.md
-            # But in the final string: base -> skills -> mode fragment -> agent instructions -> AGENTS.md
-            has_agent_instructions = "----- AGENT INSTRUCTIONS -----" in prompt
-            has_agents_md = "----- BEGIN AGENTS.md" in prompt
-
-            # Mode is trickier - it's inserted between skills and agent instructions
-            # If there's content between "Available skills:" (or base end) and agent instructions/AGENTS.md
-            # A mode fragment exists if:
-            # 1. Agent instructions exist AND there's content between skills and agent instructions
-            # 2. OR no agent instructions but there's content between skills and AGENTS.md
-            skills_end = prompt.rfind("Available skills:")
-            if skills_end == -1:
-                skills_end = prompt.find("Available skills: (none)")
-
-            if skills_end != -1:
-                # Find the end of the skills section (end of that line or next section)
-                lines_after_skills = prompt[skills_end:].split("\n")
-                # Skip the "Available skills:" line and any skill listing lines
-                idx = 1
-                while idx < len(lines_after_skills) and lines_after_skills[idx].strip():
-                    idx += 1
-
-                # Now check what comes after
-                remaining = "\n".join(lines_after_skills[idx:]).strip()
-                # Mode fragment exists if there's content before agent instructions or AGENTS.md
-                if remaining:
-                    # Check if the remaining content starts with agent instructions or AGENTS.md
-                    # If not, it's a mode fragment
-                    if not remaining.startswith("-----"):
-                        sections.append("mode")
-
-            if has_agent_instructions:
+            if "----- AGENT INSTRUCTIONS -----" in prompt:
                 sections.append("agent instructions")
-
-            if has_agents_md:
+            if "----- BEGIN AGENTS.md" in prompt:
                 sections.append("AGENTS.md")
 
+            skills_start = prompt.rfind("Available skills:")
+            if skills_start != -1:
+                sections.append("skills")
+                # The skills list ends at the first blank line; any text after it
+                # is the mode fragment.
+                list_end = prompt.find("\n\n", skills_start)
+                if list_end != -1 and _NON_SPACE.search(prompt, list_end):
+                    sections.append("mode")
+
             sections_str = ", ".join(sections)
             self.console.print(f"[dim]System Prompt sections:[/] {sections_str}")
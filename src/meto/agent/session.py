@@ -4,13 +4,18 @@ from __future__ import annotations
 
 import json
 import logging
-import random
+import os
+import secrets
+import sys
 import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
-from datetime import UTC, datetime
+from datetime import datetime
 from pathlib import Path
 from typing import Any, override
 
+from meto.agent import _json
 from meto.agent.modes.base import ModeExitResult, SessionMode
 from meto.agent.todo import TodoManager
 from meto.conf import settings
@@ -20,9 +25,12 @@ logger = logging.getLogger("agent")
 
 def generate_session_id() -> str:
     """Generate timestamp-based session ID: {timestamp}-{random_suffix}."""
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    random_suffix = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=6))
-    return f"{timestamp}-{random_suffix}"
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return f"{timestamp}-{secrets.token_hex(3)}"
+
+
+# O_BINARY keeps Windows from translating newlines; it is 0 elsewhere.
+_APPEND_FLAGS = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
 
 
 class SessionLogger(ABC):
@@ -50,6 +58,16 @@ class SessionLogger(ABC):
         del content
         raise NotImplementedError
 
+    @abstractmethod
+    def reset(self) -> None:
+        """Discard everything logged so far."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release any resources held by the logger."""
+        raise NotImplementedError
+
 
 class NullSessionLogger(SessionLogger):
     """No-op session logger."""
@@ -69,6 +87,14 @@ class NullSessionLogger(SessionLogger):
     def log_tool(self, tool_call_id: str, content: str) -> None:
         pass
 
+    @override
+    def reset(self) -> None:
+        pass
+
+    @override
+    def close(self) -> None:
+        pass
+
 
 class FileSessionLogger(SessionLogger):
     """Append-only JSONL logger for chat history persistence."""
@@ -79,22 +105,58 @@ class FileSessionLogger(SessionLogger):
         self.session_id: str = session_id or generate_session_id()
         super().__init__(self.session_id)
         self.session_file: Path = session_dir / f"session-{self.session_id}.jsonl"
+        # Serializes appends with opening and closing the descriptor.
         self._lock: threading.Lock = threading.Lock()
+        # O_APPEND descriptor, opened on the first write and kept for the logger's lifetime.
+        self._fd: int | None = None
+        # Closes the descriptor when the logger is collected or at interpreter exit.
+        self._fd_closer: weakref.finalize[[int], None] | None = None
 
         # Ensure parent directory exists
         self.session_file.parent.mkdir(parents=True, exist_ok=True)
 
+    def _open(self) -> int:
+        """Open the session file for appending. Caller holds the lock."""
+        fd = os.open(self.session_file, _APPEND_FLAGS, 0o644)
+        self._fd = fd
+        self._fd_closer = weakref.finalize(self, os.close, fd)
+        return fd
+
     def _append(self, message: dict[str, Any]) -> None:
-        """Thread-safe append to JSONL file."""
+        """Append one record to the JSONL file.
+
+        The record goes to the kernel in unbuffered O_APPEND writes, so it is on disk
+        even if the process dies. Holding the lock keeps close() from closing the
+        descriptor mid-record and keeps a short write's remainder next to its start.
+        """
+        data = _json.dumps(message, newline=True)
+        with self._lock:
+            fd = self._fd if self._fd is not None else self._open()
+            written = os.write(fd, data)
+            while written < len(data):  # short writes are rare but allowed
+                written += os.write(fd, data[written:])
+
+    @override
+    def reset(self) -> None:
+        """Truncate the session file; later records start a fresh log."""
         with self._lock:
-            with open(self.session_file, "a", encoding="utf-8") as f:
-                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+            fd = self._fd if self._fd is not None else self._open()
+            os.ftruncate(fd, 0)
+
+    @override
+    def close(self) -> None:
+        """Close the session file (a later write reopens it)."""
+        with self._lock:
+            if self._fd_closer is not None:
+                self._fd_closer()
+                self._fd_closer = None
+            self._fd = None
 
     @override
     def log_user(self, content: str) -> None:
         """Log user message with timestamp."""
         msg = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
+            "timestamp": _json.iso_timestamp(),
             "role": "user",
             "content": content,
             "session_id": self.session_id,
@@ -105,7 +167,7 @@ class FileSessionLogger(SessionLogger):
     def log_assistant(self, content: str | None, tool_calls: list[Any] | None) -> None:
         """Log assistant response with optional tool_calls."""
         msg: dict[str, Any] = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
+            "timestamp": _json.iso_timestamp(),
             "role": "assistant",
             "content": content,
             "session_id": self.session_id,
@@ -118,7 +180,7 @@ class FileSessionLogger(SessionLogger):
     def log_tool(self, tool_call_id: str, content: str) -> None:
         """Log tool execution result."""
         msg = {
-            "timestamp": datetime.now(tz=UTC).isoformat(),
+            "timestamp": _json.iso_timestamp(),
             "role": "tool",
             "tool_call_id": tool_call_id,
             "content": content,
@@ -137,19 +199,20 @@ def load_session(session_id: str, session_dir: Path = settings.SESSION_DIR) -> l
     if not session_file.exists():
         return []
 
-    messages = []
+    messages: list[dict[str, Any]] = []
     try:
-        with open(session_file, encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    raw = json.loads(line)
-                    # Extract OpenAI message format, strip metadata
-                    msg: dict[str, Any] = {"role": raw["role"], "content": raw.get("content")}
-                    if "tool_calls" in raw:
-                        msg["tool_calls"] = raw["tool_calls"]
-                    if "tool_call_id" in raw:
-                        msg["tool_call_id"] = raw["tool_call_id"]
-                    messages.append(msg)
+        for line in session_file.read_bytes().splitlines():
+            if not line.strip():
+                continue
+            # Records are the OpenAI message plus metadata; strip the metadata in
+            # place. Interning the role lets later `role == "user"` checks hit the
+            # identity fast path, as they do for messages built from string literals.
+            msg: dict[str, Any] = _json.loads(line)
+            msg.pop("timestamp", None)
+            msg.pop("session_id", None)
+            msg["role"] = sys.intern(msg["role"])
+            msg.setdefault("content", None)
+            messages.append(msg)
     except (OSError, json.JSONDecodeError) as e:
         logger.error(f"Failed to load session {session_id}: {e}")
         return []
@@ -171,10 +234,17 @@ def list_session_files(session_dir: Path = settings.SESSION_DIR) -> list[Path]:
 def get_session_info(path: Path) -> dict[str, Any]:
     """Return session metadata: id, created, modified, size, message_count."""
     stat = path.stat()
+    # Count lines on raw bytes: no decoding and no per-line strings.
     message_count = 0
     try:
-        with open(path, encoding="utf-8") as f:
-            message_count = sum(1 for _ in f)
+        with open(path, "rb") as f:
+            last = b""
+            while chunk := f.read(1 << 16):
+                message_count += chunk.count(b"\n")
+                last = chunk
+            # A final line without a trailing newline still counts.
+            if last and not last.endswith(b"\n"):
+                message_count += 1
     except OSError:
         message_count = 0
 
@@ -199,6 +269,8 @@ class Session:
     mode: SessionMode | None
     last_mode_exit: ModeExitResult | None
     yolo_mode: bool
+    # (static, dynamic) system prompt snapshot used when BOOTSTRAP_FREEZE_MODE is "session".
+    frozen_system_prompt: tuple[str, str] | None
 
     def __init__(
         self,
@@ -220,6 +292,7 @@ class Session:
         self.mode = mode
         self.last_mode_exit = None
         self.yolo_mode = yolo_mode if yolo_mode is not None else settings.YOLO_MODE
+        self.frozen_system_prompt = None
 
     def enter_mode(self, mode: SessionMode) -> None:
         """Enter a session mode.
@@ -235,6 +308,7 @@ class Session:
             raise RuntimeError(f"Session already in mode: {self.mode.name}")
         mode.enter(self)
         self.mode = mode
+        self.frozen_system_prompt = None
 
     def exit_mode(self) -> ModeExitResult | None:
         """Exit current session mode, if any."""
@@ -245,6 +319,7 @@ class Session:
         result = self.mode.exit(self)
         self.last_mode_exit = result
         self.mode = None
+        self.frozen_system_prompt = None
         return result
 
     def clear(self) -> None:
@@ -252,17 +327,43 @@ class Session:
         self.history.clear()
         self.todos.clear()
         self.session_id = generate_session_id()
+        self.session_logger.close()
         self.session_logger = self.session_logger_cls(self.session_id)
         self.mode = None
         self.last_mode_exit = None
+        self.frozen_system_prompt = None
+
+    def clear_history(self) -> None:
+        """Clear history and continue under a new session ID (todos and mode are kept)."""
+        self.history.clear()
+        self.session_id = generate_session_id()
+        self.session_logger.close()
+        self.session_logger = self.session_logger_cls(self.session_id)
+        self.frozen_system_prompt = None
 
     def renew(self) -> None:
         """Generate new session ID with current history preserved."""
         self.session_id = generate_session_id()
+        self.session_logger.close()
         self.session_logger = self.session_logger_cls(self.session_id)
         self.todos = TodoManager()
         self.mode = None
         self.last_mode_exit = None
+        self.frozen_system_prompt = None
+        self._log_history()
+
+    def rewrite_log(self) -> None:
+        """Replace the session log with the current history, keeping the session ID.
+
+        Unlike renew(), mode, todos and session ID are left alone, so this is safe
+        to run between turns (e.g. after automatic compaction).
+        """
+        self.session_logger.reset()
+        self.frozen_system_prompt = None
+        self._log_history()
+
+    def _log_history(self) -> None:
+        """Write every user, assistant and tool message in history to the logger."""
         for msg in self.history:
             if msg["role"] == "user":
                 self.session_logger.log_user(msg["content"])
@@ -7,34 +7,69 @@ Used by both tool execution and hooks system.
 from __future__ import annotations
 
 import os
+import re
+import shlex
 import shutil
 import subprocess
+from functools import lru_cache
 
 from meto.conf import settings
 
 
-def pick_shell_runner() -> list[str] | None:
+@lru_cache(maxsize=1)
+def pick_shell_runner() -> tuple[str, ...] | None:
     """Pick an available shell runner.
 
     We prefer bash if present (Git Bash / WSL), otherwise PowerShell.
-    Returns a base argv list to which the actual command string should be appended.
+    Returns a base argv tuple to which the actual command string should be appended.
+    The PATH lookup runs once per process; use ``pick_shell_runner.cache_clear()``
+    if PATH changes.
     """
 
     bash = shutil.which("bash")
     if bash:
-        return [bash, "-lc"]
+        return (bash, "-lc")
 
     pwsh = shutil.which("pwsh")
     if pwsh:
-        return [pwsh, "-NoProfile", "-Command"]
+        return (pwsh, "-NoProfile", "-Command")
 
     powershell = shutil.which("powershell")
     if powershell:
-        return [powershell, "-NoProfile", "-Command"]
+        return (powershell, "-NoProfile", "-Command")
 
     return None
 
 
+# Characters shlex treats as token separators (shlex.shlex.whitespace).
+_SHLEX_WHITESPACE = " \t\r\n"
+_ARGV_WHITESPACE = re.compile(f"[{_SHLEX_WHITESPACE}]+")
+
+
+def split_command(text: str) -> list[str]:
+    """Split a command line into argv tokens.
+
+    Quotes group tokens and are removed, `#` is not a comment, and backslashes
+    are kept literally (so Windows paths survive).
+    """
+
+    # Fast path: with escapes and comments disabled, quotes are the only thing
+    # the lexer interprets, so unquoted input is a plain whitespace split.
+    if '"' not in text and "'" not in text:
+        stripped = text.strip(_SHLEX_WHITESPACE)
+        return _ARGV_WHITESPACE.split(stripped) if stripped else []
+
+    # We intentionally avoid `shlex.split(..., posix=False)` because it tends to
+    # preserve quotes as literal characters. We also disable escaping because
+    # backslashes are common in Windows paths and should not be treated as
+    # escape sequences.
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    lexer.escape = ""
+    return list(lexer)
+
+
 def truncate(text: str, limit: int) -> str:
     if len(text) <= limit:
         return text
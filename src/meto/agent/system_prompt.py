@@ -2,14 +2,19 @@
 
 The system prompt is built on every model call by combining:
 - a static base prompt (tooling rules and capabilities)
+- optional agent-specific instructions
 - repository instructions from AGENTS.md
-- optional plan-mode instructions (when active in the session)
+- the skills list and optional plan-mode instructions (when active in the session)
 
-We intentionally re-read AGENTS.md each time so edits take effect immediately
-without restarting the CLI.
+The parts that rarely change come first and the parts that change with skills or
+modes come last, so providers can cache the longest possible prompt prefix.
+
+AGENTS.md is stat'ed on every call so edits take effect immediately without
+restarting the CLI; the assembled prompt is reused while nothing has changed.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -45,48 +50,93 @@ Subagent pattern (via run_task tool):
 Skills (via load_skill tool):
 - On-demand domain expertise for specialized tasks
 - Load skill content by name when needed
-{skills_list}
 """
 
+# Delimiters around the AGENTS.md block, with the blank line before and the
+# newlines after already attached.
+_AGENTS_MD_BEGIN = "\n\n----- BEGIN AGENTS.md (project instructions) -----\n"
+_AGENTS_MD_END = "\n----- END AGENTS.md -----\n"
+
+# Recently built prompts, keyed by everything build_system_prompt() depends on.
+_PROMPT_CACHE_SIZE = 8
+_prompt_cache: dict[tuple[object, ...], tuple[str, str]] = {}
+
 
 def build_system_prompt(session: "Session | None" = None, agent: "Agent | None" = None) -> str:
-    """Build the system prompt.
+    """Build the system prompt as a single string (see build_system_prompt_parts())."""
+
+    return "\n".join(build_system_prompt_parts(session, agent))
 
-    Appends project memory/user instructions from AGENTS.md in the current
-    working directory.
+
+def build_system_prompt_parts(
+    session: "Session | None" = None, agent: "Agent | None" = None
+) -> tuple[str, str]:
+    """Build the system prompt as a (static prefix, dynamic suffix) pair.
+
+    The prefix holds the base prompt, agent instructions and AGENTS.md from the
+    current working directory; the suffix holds the skills list and the mode
+    fragment, which change more often.
 
     Args:
         session: Optional session for plan mode context
         agent: Optional agent for agent-specific prompt
 
-    Note: This intentionally does not cache; it re-reads AGENTS.md each call.
+    The result is cached per (cwd, AGENTS.md stat, skills, mode fragment, agent
+    prompt), so AGENTS.md is only re-read after it changes.
     """
 
     cwd = os.getcwd()
+    agents_path = Path(cwd) / "AGENTS.md"
 
-    # Build skills list for prompt
     skills = get_skill_loader().get_skill_descriptions()
-    if skills:
-        skill_lines = [f"- {name}: {desc}" for name, desc in sorted(skills.items())]
-        skills_list = "Available skills:\n" + "\n".join(skill_lines)
-    else:
-        skills_list = "Available skills: (none)"
+    fragment = (
+        session.mode.system_prompt_fragment() if session and session.mode is not None else None
+    )
+    agent_prompt = agent.prompt if agent else None
 
-    prompt = SYSTEM_PROMPT.format(cwd=cwd, skills_list=skills_list)
+    # Everything the prompt depends on goes into the key; AGENTS.md contributes its
+    # stat signature so an edit invalidates the entry without re-reading the file.
+    try:
+        st = agents_path.stat()
+        agents_sig: tuple[int, int, int] | None = (st.st_mtime_ns, st.st_size, st.st_ino)
+    except FileNotFoundError:
+        agents_sig = None
+    except OSError:
+        # Let the uncached path produce the "unreadable" marker.
+        return _build_system_prompt_parts(cwd, agents_path, skills, fragment, agent_prompt)
 
-    # Allow session modes to augment the prompt.
-    if session and session.mode is not None:
-        fragment = session.mode.system_prompt_fragment()
-        if fragment:
-            prompt += fragment
+    key = (cwd, agents_sig, tuple(sorted(skills.items())), fragment, agent_prompt)
+    parts = _prompt_cache.get(key)
+    if parts is None:
+        parts = _build_system_prompt_parts(cwd, agents_path, skills, fragment, agent_prompt)
+        if len(_prompt_cache) >= _PROMPT_CACHE_SIZE:
+            # FIFO eviction: dicts iterate in insertion order.
+            del _prompt_cache[next(iter(_prompt_cache))]
+        _prompt_cache[key] = parts
+    return parts
 
-    # Allow agents to augment the prompt (e.g., planner agent instructions)
-    if agent and agent.prompt:
-        prompt += f"\n\n----- AGENT INSTRUCTIONS -----\n{agent.prompt}\n----- END AGENT INSTRUCTIONS -----"
 
-    agents_path = Path(cwd) / "AGENTS.md"
-    begin = "----- BEGIN AGENTS.md (project instructions) -----"
-    end = "----- END AGENTS.md -----"
+@lru_cache(maxsize=4)
+def _prompt_header(cwd: str) -> str:
+    """Return SYSTEM_PROMPT formatted for cwd."""
+
+    return SYSTEM_PROMPT.format(cwd=cwd)
+
+
+def _build_system_prompt_parts(
+    cwd: str,
+    agents_path: Path,
+    skills: dict[str, str],
+    fragment: str | None,
+    agent_prompt: str | None,
+) -> tuple[str, str]:
+    """Assemble the system prompt parts from their inputs (uncached)."""
+
+    prompt = _prompt_header(cwd)
+
+    # Allow agents to augment the prompt (e.g., planner agent instructions)
+    if agent_prompt:
+        prompt += f"\n\n----- AGENT INSTRUCTIONS -----\n{agent_prompt}\n----- END AGENT INSTRUCTIONS -----"
 
     try:
         agents_text = agents_path.read_text(encoding="utf-8", errors="replace")
@@ -97,4 +147,17 @@ def build_system_prompt(session: "Session | None" = None, agent: "Agent | None"
 
     # Always include the delimiter block so the model reliably knows where the
     # project memory starts/ends.
-    return "\n".join([prompt.rstrip(), "", begin, agents_text.rstrip(), end, ""])
+    static = f"{prompt.rstrip()}{_AGENTS_MD_BEGIN}{agents_text.rstrip()}{_AGENTS_MD_END}"
+
+    # Build skills list for prompt
+    if skills:
+        skill_lines = [f"- {name}: {desc}" for name, desc in sorted(skills.items())]
+        dynamic = "Available skills:\n" + "\n".join(skill_lines)
+    else:
+        dynamic = "Available skills: (none)"
+
+    # Allow session modes to augment the prompt.
+    if fragment:
+        dynamic += fragment
+
+    return static, dynamic
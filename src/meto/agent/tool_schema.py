@@ -286,4 +286,4 @@ TOOLS: list[dict[str, Any]] = [
 ]
 
 TOOLS_BY_NAME = {tool["function"]["name"]: tool for tool in TOOLS}
-AVAILABLE_TOOLS = list(TOOLS_BY_NAME.keys())
+AVAILABLE_TOOLS: frozenset[str] = frozenset(TOOLS_BY_NAME)
@@ -12,7 +12,7 @@ from prompt_toolkit.enums import EditingMode
 
 from meto.agent.agent import Agent
 from meto.agent.agent_loop import run_agent_loop
-from meto.agent.commands import handle_slash_command
+from meto.agent.commands import handle_slash_command, maybe_auto_compact
 from meto.agent.exceptions import AgentInterrupted
 from meto.agent.session import Session, get_session_info, list_session_files
 from meto.conf import settings
@@ -79,25 +79,29 @@ def _run_single_prompt(
 
     # Handle slash commands
     was_handled, cmd_result = handle_slash_command(user_input, session)
-
-    if was_handled:
-        if cmd_result:
-            # Determine agent based on context
-            if cmd_result.context == "fork":
-                agent = (
-                    Agent.subagent(cmd_result.agent, session)
-                    if cmd_result.agent
-                    else Agent.fork(cmd_result.allowed_tools or "*", session)
-                )
-            else:
-                agent = get_agent_for_session()
-
-            for output in run_agent_loop(cmd_result.prompt, agent):
-                print(output, flush=True)
+    if was_handled and not cmd_result:
         return
 
-    # No slash command, run agent loop with user input
-    for output in run_agent_loop(user_input, get_agent_for_session()):
+    # Compact before picking the agent so it sees the history it will run with.
+    maybe_auto_compact(session)
+
+    if cmd_result:
+        # Determine agent based on context
+        if cmd_result.context == "fork":
+            agent = (
+                Agent.subagent(cmd_result.agent, session)
+                if cmd_result.agent
+                else Agent.fork(cmd_result.allowed_tools or "*", session)
+            )
+        else:
+            agent = get_agent_for_session()
+        prompt = cmd_result.prompt
+    else:
+        # No slash command, run agent loop with user input
+        agent = get_agent_for_session()
+        prompt = user_input
+
+    for output in run_agent_loop(prompt, agent):
         print(output, flush=True)
 
 
@@ -1,8 +1,9 @@
 """Configuration management for meto using Pydantic Settings."""
 
-import random
+import secrets
 from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -38,6 +39,11 @@ class Settings(BaseSettings):
         description="Default model name to use with LiteLLM",
     )
 
+    SUMMARY_MODEL: str = Field(
+        default="",
+        description="Model used by /compact to summarize history (empty = DEFAULT_MODEL).",
+    )
+
     MODEL_CONTEXT_WINDOWS: dict[str, int] = Field(
         default={
             "gpt-4.1": 128000,
@@ -71,6 +77,37 @@ class Settings(BaseSettings):
         description="Maximum characters captured from tool result.",
     )
 
+    STREAM_RESPONSES: bool = Field(
+        default=False,
+        description="Stream model responses, echoing assistant text as it is generated.",
+    )
+
+    BOOTSTRAP_FREEZE_MODE: Literal["live", "session"] = Field(
+        default="live",
+        description=(
+            "System prompt refresh policy: 'live' rebuilds it every turn; 'session' "
+            "snapshots it once per session so providers can cache the prompt prefix."
+        ),
+    )
+
+    COMPACT_KEEP_TAIL: int = Field(
+        default=6,
+        description="Number of most recent messages /compact keeps verbatim.",
+    )
+
+    COMPACT_CONCURRENCY: int = Field(
+        default=8,
+        description="Maximum concurrent summarization requests when compacting in bulk.",
+    )
+
+    AUTO_COMPACT_THRESHOLD: float = Field(
+        default=0.0,
+        description=(
+            "Fraction of the model context window at which the history is compacted "
+            "automatically before a prompt (0 disables; e.g. 0.8)."
+        ),
+    )
+
     # --- Directories ---
 
     SESSION_DIR: Path = Field(
@@ -83,6 +120,11 @@ class Settings(BaseSettings):
         description="Directory to store plan files.",
     )
 
+    COMPACT_CACHE_DIR: Path = Field(
+        default=Path.home() / ".meto" / "cache" / "compact",
+        description="Directory for cached /compact summaries.",
+    )
+
     @field_validator("SESSION_DIR", "PLAN_DIR")
     @classmethod
     def ensure_dir_exists(cls, v: Path) -> Path:
@@ -109,6 +151,11 @@ class Settings(BaseSettings):
         description="Path to hooks configuration file.",
     )
 
+    HOOKS_PARALLEL: bool = Field(
+        default=True,
+        description="Run post_tool_use/session_start hooks concurrently.",
+    )
+
     # --- Logging ---
 
     LOG_DIR: Path = Field(
@@ -120,8 +167,7 @@ class Settings(BaseSettings):
     def log_file(self) -> Path:
         """Generate actual log file path with timestamp and random suffix."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        random_suffix = "".join(random.choices("abcdefghijklmnopqrstuvwxyz0123456789", k=6))
-        return self.LOG_DIR / f"agent_reasoning_{timestamp}_{random_suffix}.jsonl"
+        return self.LOG_DIR / f"agent_reasoning_{timestamp}_{secrets.token_hex(3)}.jsonl"
 
     @field_validator("LOG_DIR")
     @classmethod
@@ -20,6 +20,7 @@ def _isolate_meto_settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> N
     commands_dir = tmp_path / ".meto" / "commands"
     skills_dir = tmp_path / ".meto" / "skills"
     hooks_file = tmp_path / ".meto" / "hooks.yaml"
+    compact_cache_dir = tmp_path / "cache" / "compact"
 
     for d in [session_dir, plan_dir, agents_dir, commands_dir, skills_dir, hooks_file.parent]:
         d.mkdir(parents=True, exist_ok=True)
@@ -41,6 +42,7 @@ def _isolate_meto_settings(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> N
     monkeypatch.setattr(settings, "COMMANDS_DIR", commands_dir, raising=False)
     monkeypatch.setattr(settings, "SKILLS_DIR", skills_dir, raising=False)
     monkeypatch.setattr(settings, "HOOKS_FILE", hooks_file, raising=False)
+    monkeypatch.setattr(settings, "COMPACT_CACHE_DIR", compact_cache_dir, raising=False)
 
     # Clear caches that memoize directories
     clear_agent_cache()
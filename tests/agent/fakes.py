@@ -0,0 +1,27 @@
+"""Test doubles shared by the agent tests."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+from typing import Any
+
+
+class FakeCompletions:
+    """Stand-in for ``client.chat.completions`` that replays queued responses.
+
+    Each ``create`` call records its kwargs and returns the next entry of
+    ``responses``. ``messages`` is snapshotted because callers may keep mutating
+    the list they passed in.
+    """
+
+    def __init__(self, responses: list[Any] | None = None) -> None:
+        self.responses: list[Any] = responses if responses is not None else []
+        self.calls: list[dict[str, Any]] = []
+
+    def create(self, **kwargs: Any) -> Any:
+        self.calls.append({**kwargs, "messages": list(kwargs["messages"])})
+        return self.responses.pop(0)
+
+    def client(self) -> SimpleNamespace:
+        """Return an object shaped like an OpenAI client that uses these completions."""
+        return SimpleNamespace(chat=SimpleNamespace(completions=self))
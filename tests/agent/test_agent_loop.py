@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from fakes import FakeCompletions
+from openai.types.chat import ChatCompletionChunk, ChatCompletionMessageToolCall
+
+import meto.agent.agent_loop as agent_loop
+from meto.agent.agent import Agent
+from meto.agent.reasoning_log import ReasoningLogger
+from meto.agent.session import NullSessionLogger, Session
+from meto.conf import settings
+
+
+def _response(content: str | None, tool_calls: list[Any] | None = None) -> SimpleNamespace:
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    usage = SimpleNamespace(prompt_tokens=10, completion_tokens=2)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def _tool_call(call_id: str, name: str, arguments: str) -> ChatCompletionMessageToolCall:
+    return ChatCompletionMessageToolCall.model_validate(
+        {"id": call_id, "type": "function", "function": {"name": name, "arguments": arguments}}
+    )
+
+
+@pytest.fixture
+def fake_completions(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> FakeCompletions:
+    # Keep the reasoning trace out of the real log directory.
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    monkeypatch.setattr(settings, "LOG_DIR", log_dir)
+
+    completions = FakeCompletions()
+    client = completions.client()
+    monkeypatch.setattr(agent_loop, "_get_client", lambda: client)
+    return completions
+
+
+def test_run_agent_loop_executes_tool_calls_and_logs_prompt_once(
+    fake_completions: FakeCompletions, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    logged_prompts: list[str] = []
+    monkeypatch.setattr(
+        ReasoningLogger, "log_system_prompt", lambda _self, prompt: logged_prompts.append(prompt)
+    )
+    fake_completions.responses = [
+        _response(None, [_tool_call("tc_1", "list_dir", '{"path": "."}')]),
+        _response("All done."),
+    ]
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+    agent = Agent.main(session)
+
+    output = list(agent_loop.run_agent_loop("list files", agent))
+
+    assert output == ["All done."]
+    assert [m["role"] for m in session.history] == ["user", "assistant", "tool", "assistant"]
+    assert session.history[1]["tool_calls"][0]["function"]["name"] == "list_dir"
+    assert session.history[2]["tool_call_id"] == "tc_1"
+
+    assert len(fake_completions.calls) == 2
+    second_messages = fake_completions.calls[1]["messages"]
+    assert [m["role"] for m in second_messages[:2]] == ["system", "system"]
+    assert "BEGIN AGENTS.md" in second_messages[0]["content"]
+    assert second_messages[1]["content"].startswith("Available skills:")
+    assert second_messages[2:] == session.history[:3]
+    assert len(logged_prompts) == 1
+
+
+def test_session_freeze_mode_reuses_prompt_until_session_resets(
+    fake_completions: FakeCompletions, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(settings, "BOOTSTRAP_FREEZE_MODE", "session")
+    fake_completions.responses = [_response("one"), _response("two"), _response("three")]
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+    agent = Agent.main(session)
+
+    list(agent_loop.run_agent_loop("first", agent))
+    (tmp_path / "AGENTS.md").write_text("Edited mid-session.\n", encoding="utf-8")
+    list(agent_loop.run_agent_loop("second", agent))
+    session.clear()
+    list(agent_loop.run_agent_loop("third", agent))
+
+    system_texts = [call["messages"][0]["content"][0]["text"] for call in fake_completions.calls]
+    assert system_texts[0] == system_texts[1]
+    assert "Edited mid-session." not in system_texts[1]
+    assert "Edited mid-session." in system_texts[2]
+    first_messages = fake_completions.calls[0]["messages"]
+    assert first_messages[0]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert "cache_control" not in first_messages[1]
+
+
+def test_tool_call_dict_matches_model_dump() -> None:
+    tc = _tool_call("tc_9", "read_file", '{"path": "a.txt"}')
+    assert agent_loop._tool_call_dict(tc) == tc.model_dump()
+
+
+class _FakeStream:
+    def __init__(self, chunks: list[ChatCompletionChunk]) -> None:
+        self.chunks = chunks
+
+    def __enter__(self) -> _FakeStream:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        return None
+
+    def __iter__(self) -> Any:
+        return iter(self.chunks)
+
+
+def _chunk(
+    delta: dict[str, Any] | None, usage: dict[str, int] | None = None
+) -> ChatCompletionChunk:
+    choices = [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": None}]
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "test",
+            "choices": choices,
+            "usage": usage,
+        }
+    )
+
+
+def test_streamed_responses_are_assembled_into_tool_calls(
+    fake_completions: FakeCompletions, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "STREAM_RESPONSES", True)
+    fake_completions.responses = [
+        _FakeStream(
+            [
+                _chunk({"role": "assistant", "content": "Look"}),
+                _chunk({"content": "ing."}),
+                _chunk(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": 0,
+                                "id": "tc_1",
+                                "type": "function",
+                                "function": {"name": "list_dir", "arguments": '{"pa'},
+                            }
+                        ]
+                    }
+                ),
+                _chunk({"tool_calls": [{"index": 0, "function": {"arguments": 'th": "."}'}}]}),
+                _chunk(None, usage={"prompt_tokens": 5, "completion_tokens": 3, "total_tokens": 8}),
+            ]
+        ),
+        _FakeStream([_chunk({"role": "assistant", "content": "Done."})]),
+    ]
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+    agent = Agent.main(session)
+
+    output = list(agent_loop.run_agent_loop("list files", agent))
+
+    assert output == ["Looking.", "Done."]
+    assert fake_completions.calls[0]["stream"] is True
+    assistant = session.history[1]
+    assert assistant["tool_calls"] == [
+        {
+            "id": "tc_1",
+            "function": {"arguments": '{"path": "."}', "name": "list_dir"},
+            "type": "function",
+        }
+    ]
+    assert assistant["prompt_tokens"] == 5
+    assert session.history[2]["tool_call_id"] == "tc_1"
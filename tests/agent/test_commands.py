@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import shlex
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
 
+import openai
 import pytest
+from fakes import FakeCompletions
 
+import meto.agent.commands as commands
 from meto.agent.commands import (
     ArgumentSubstitutionError,
     CustomCommandResult,
+    _compact_history,
     _parse_slash_command_argv,
     _substitute_arguments,
+    _summarize_conversation,
+    compact_many,
     handle_slash_command,
 )
-from meto.agent.session import NullSessionLogger, Session
+from meto.agent.modes.plan import PlanMode
+from meto.agent.session import FileSessionLogger, NullSessionLogger, Session, load_session
 from meto.conf import settings
 
 
@@ -33,6 +43,24 @@ def test_handle_slash_command_builtin_help_is_handled(capsys: pytest.CaptureFixt
     assert "Built-in commands:" in out
 
 
+def test_builtin_dispatch_skips_custom_command_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _fail() -> dict[str, Path]:
+        raise AssertionError("built-in commands must not scan COMMANDS_DIR")
+
+    monkeypatch.setattr(commands, "_get_custom_command_files", _fail)
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+
+    assert handle_slash_command("/help", session) == (True, None)
+
+
+def test_missing_commands_dir_is_cached(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "COMMANDS_DIR", tmp_path / "missing")
+
+    first = commands._get_custom_command_files()
+    assert first == {}
+    assert commands._get_custom_command_files() is first
+
+
 def test_handle_slash_command_custom_md_returns_custom_result(tmp_path: Path) -> None:
     session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
 
@@ -49,6 +77,24 @@ def test_handle_slash_command_custom_md_returns_custom_result(tmp_path: Path) ->
     assert "a b" in result.prompt
 
 
+def test_handle_slash_command_picks_up_new_custom_command(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+
+    handled, result = handle_slash_command("/bar", session)
+    assert handled is True
+    assert result is None
+    assert "Unknown command: /bar" in capsys.readouterr().out
+
+    (settings.COMMANDS_DIR / "bar.md").write_text("Run bar\n", encoding="utf-8")
+
+    handled, result = handle_slash_command("/bar", session)
+    assert handled is True
+    assert isinstance(result, CustomCommandResult)
+    assert result.prompt == "Run bar"
+
+
 def test_command_precedence_builtin_over_custom(
     tmp_path: Path, capsys: pytest.CaptureFixture[str]
 ) -> None:
@@ -74,6 +120,187 @@ def test_argument_substitution_out_of_bounds_raises() -> None:
         _substitute_arguments("Value: $ARGUMENTS[1]", ["only0"])
 
 
+@pytest.mark.parametrize(
+    "text",
+    [
+        "/help",
+        "  /export a  b\t c\n",
+        "   ",
+        "/a #b",
+        '/export "my file.json" --full',
+        "/x 'a b' c",
+    ],
+)
+def test_parse_slash_command_argv_fast_path_matches_lexer(text: str) -> None:
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    lexer.escape = ""
+    assert _parse_slash_command_argv(text) == list(lexer)
+
+
 def test_parse_slash_command_argv_preserves_backslashes() -> None:
     argv = _parse_slash_command_argv(r"/export C:\\Users\\me\\file.json")
     assert argv == ["/export", r"C:\\Users\\me\\file.json"]
+
+
+def test_summarize_conversation_streams_with_summary_model(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    def _chunk(text: str | None) -> SimpleNamespace:
+        return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    completions = FakeCompletions([[_chunk("Short "), _chunk(None), _chunk("summary.")]])
+    monkeypatch.setattr(openai, "OpenAI", lambda **_kwargs: completions.client())
+    monkeypatch.setattr(settings, "SUMMARY_MODEL", "small-model")
+
+    summary = _summarize_conversation("user: hi")
+
+    assert summary == "Short summary."
+    assert completions.calls[0]["model"] == "small-model"
+    assert completions.calls[0]["stream"] is True
+    assert "Short summary." in capsys.readouterr().out
+
+
+def test_compact_history_keeps_system_and_recent_tail(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "COMPACT_KEEP_TAIL", 2)
+    summarized: list[str] = []
+
+    def _fake_summarize(text: str) -> str:
+        summarized.append(text)
+        return "old stuff"
+
+    monkeypatch.setattr(commands, "_summarize_conversation", _fake_summarize)
+
+    history: list[dict[str, Any]] = [
+        {"role": "system", "content": "sys"},
+        {"role": "user", "content": "first"},
+        {"role": "assistant", "content": "", "tool_calls": [{"id": "tc_1"}]},
+        {"role": "tool", "tool_call_id": "tc_1", "content": "ok"},
+        {"role": "assistant", "content": "done"},
+    ]
+    _compact_history(history)
+
+    assert summarized == ["user: first"]
+    assert [m["role"] for m in history] == ["system", "user", "assistant", "tool", "assistant"]
+    assert history[1]["content"] == "[Previous conversation summary]: old stuff"
+    assert history[-1]["content"] == "done"
+
+
+def test_compact_history_reuses_cached_summary(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LLM_API_KEY", "test-key")
+    calls: list[str] = []
+
+    def _fake_summarize(text: str) -> str:
+        calls.append(text)
+        return "cached summary"
+
+    monkeypatch.setattr(commands, "_summarize_conversation", _fake_summarize)
+
+    def _history() -> list[dict[str, Any]]:
+        return [{"role": "user", "content": f"msg {i}"} for i in range(10)]
+
+    first = _history()
+    second = _history()
+    _compact_history(first)
+    _compact_history(second)
+
+    assert len(calls) == 1
+    assert first == second
+
+
+def test_compact_many_summarizes_concurrently_and_caches(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+
+    class _FakeCompletions:
+        async def create(self, **kwargs: Any) -> SimpleNamespace:
+            text = kwargs["messages"][-1]["content"]
+            calls.append(text)
+            message = SimpleNamespace(content=f"summary of {text}")
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    class _FakeAsyncClient:
+        def __init__(self, **_kwargs: Any) -> None:
+            self.chat = SimpleNamespace(completions=_FakeCompletions())
+
+    monkeypatch.setattr(openai, "AsyncOpenAI", _FakeAsyncClient)
+    monkeypatch.setattr(settings, "COMPACT_CONCURRENCY", 2)
+
+    histories: list[list[dict[str, Any]]] = [
+        [{"role": "user", "content": "a"}],
+        [{"role": "system", "content": "only system"}],
+        [{"role": "user", "content": "b"}],
+        [{"role": "user", "content": "a"}],
+    ]
+
+    assert compact_many(histories) == [
+        "summary of user: a",
+        "",
+        "summary of user: b",
+        "summary of user: a",
+    ]
+    assert sorted(calls) == ["user: a", "user: b"]
+
+    calls.clear()
+    assert compact_many(histories[:1]) == ["summary of user: a"]
+    assert calls == []
+
+
+def test_maybe_auto_compact_only_near_the_context_window(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "COMPACT_KEEP_TAIL", 2)
+    monkeypatch.setattr(settings, "DEFAULT_MODEL", "tiny-model")
+    monkeypatch.setattr(settings, "MODEL_CONTEXT_WINDOWS", {"tiny-model": 100})
+    monkeypatch.setattr(settings, "AUTO_COMPACT_THRESHOLD", 0.5)
+    monkeypatch.setattr(commands, "_summarize_conversation", lambda _text: "short")
+
+    session = Session(session_logger_cls=NullSessionLogger)
+    session.history = [{"role": "user", "content": "x" * 40} for _ in range(4)]
+    assert commands.maybe_auto_compact(session) is False
+    assert len(session.history) == 4
+
+    session.history.append({"role": "assistant", "content": "y" * 80})
+    assert commands.maybe_auto_compact(session) is True
+    assert session.history[0]["content"] == "[Previous conversation summary]: short"
+    assert len(session.history) == 3
+
+    monkeypatch.setattr(settings, "AUTO_COMPACT_THRESHOLD", 0)
+    session.history.append({"role": "user", "content": "z" * 1000})
+    assert commands.maybe_auto_compact(session) is False
+
+
+def test_maybe_auto_compact_keeps_mode_todos_and_session_id(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setattr(settings, "LLM_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "COMPACT_KEEP_TAIL", 2)
+    monkeypatch.setattr(settings, "DEFAULT_MODEL", "tiny-model")
+    monkeypatch.setattr(settings, "MODEL_CONTEXT_WINDOWS", {"tiny-model": 100})
+    monkeypatch.setattr(settings, "AUTO_COMPACT_THRESHOLD", 0.5)
+    monkeypatch.setattr(commands, "_summarize_conversation", lambda _text: "short")
+
+    class TmpFileLogger(FileSessionLogger):
+        def __init__(self, session_id: str | None = None) -> None:
+            super().__init__(session_id=session_id, session_dir=tmp_path)
+
+    session = Session(session_logger_cls=TmpFileLogger, yolo_mode=True)
+    session.enter_mode(PlanMode())
+    session.todos.update([{"content": "a", "status": "pending", "activeForm": "a"}])
+    for i in range(5):
+        session.history.append({"role": "user", "content": f"{i}" * 40})
+        session.session_logger.log_user(f"{i}" * 40)
+    session_id = session.session_id
+
+    assert commands.maybe_auto_compact(session) is True
+
+    assert session.session_id == session_id
+    assert isinstance(session.mode, PlanMode)
+    assert [t["content"] for t in session.todos.items] == ["a"]
+    # The log is rewritten in place to match the compacted history.
+    logged = load_session(session_id, session_dir=tmp_path)
+    assert logged == session.history
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from meto.agent.loaders.frontmatter import parse_yaml_frontmatter
+from meto.agent.loaders.frontmatter import parse_yaml_frontmatter, parse_yaml_frontmatter_bytes
 
 
 def test_parse_yaml_frontmatter_with_frontmatter() -> None:
@@ -18,3 +18,19 @@ def test_parse_yaml_frontmatter_without_frontmatter() -> None:
 
     assert parsed["metadata"] == {}
     assert parsed["body"] == "Just body\nSecond line"
+
+
+def test_parse_yaml_frontmatter_bytes_matches_str_parser() -> None:
+    content = "---\nname: test\ndescription: héllo\n---\nBody text\n"
+    assert parse_yaml_frontmatter_bytes(content.encode()) == parse_yaml_frontmatter(content)
+
+
+def test_parse_yaml_frontmatter_bytes_handles_crlf_and_skips_body() -> None:
+    content = b"---\r\nname: test\r\n---\r\nLine 1\r\nLine 2\r\n"
+
+    parsed = parse_yaml_frontmatter_bytes(content)
+    assert parsed["metadata"] == {"name": "test"}
+    assert parsed["body"] == "Line 1\nLine 2"
+
+    metadata_only = parse_yaml_frontmatter_bytes(content, include_body=False)
+    assert metadata_only == {"metadata": {"name": "test"}, "body": ""}
@@ -5,7 +5,15 @@ from pathlib import Path
 
 import pytest
 
-from meto.agent.history_export import dump_agent_context, get_context_summary, save_agent_context
+import meto.agent.history_export as history_export
+from meto.agent.history_export import (
+    append_agent_message,
+    dump_agent_context,
+    format_context_summary,
+    get_context_summary,
+    load_jsonl_history,
+    save_agent_context,
+)
 
 
 def _sample_history() -> list[dict[str, object]]:
@@ -27,7 +35,7 @@ def _sample_history() -> list[dict[str, object]]:
     ]
 
 
-@pytest.mark.parametrize("fmt", ["json", "pretty_json", "markdown", "text"])
+@pytest.mark.parametrize("fmt", ["json", "pretty_json", "jsonl", "markdown", "text"])
 def test_dump_agent_context_formats(fmt: str) -> None:
     out = dump_agent_context(_sample_history(), output_format=fmt)
     assert isinstance(out, str)
@@ -48,6 +56,77 @@ def test_save_agent_context_writes_file(tmp_path: Path, capsys: pytest.CaptureFi
     assert json.loads(target.read_text("utf-8"))
 
 
+@pytest.mark.parametrize("content", ["plain ascii", "héllo ✓"])
+def test_dump_agent_context_json_matches_stdlib(content: str) -> None:
+    history = [*_sample_history(), {"role": "user", "content": content}]
+    assert dump_agent_context(history, output_format="json") == json.dumps(history, indent=2)
+
+
+@pytest.mark.parametrize("fmt", ["json", "pretty_json", "jsonl"])
+def test_dump_agent_context_handles_big_integers(fmt: str) -> None:
+    history = [{"role": "tool", "tool_call_id": "tc_1", "content": "ok", "size": 2**70}]
+    out = dump_agent_context(history, output_format=fmt)
+    assert str(2**70) in out
+
+
+def test_save_agent_context_pretty_json_keeps_unicode(tmp_path: Path) -> None:
+    history = [{"role": "user", "content": "héllo ✓"}]
+    target = tmp_path / "ctx.json"
+    save_agent_context(history, target, output_format="pretty_json")
+
+    text = target.read_text("utf-8")
+    assert "héllo ✓" in text
+    assert json.loads(text) == history
+    assert text == dump_agent_context(history, output_format="pretty_json")
+
+
+@pytest.mark.parametrize("fmt", ["json", "pretty_json", "jsonl", "markdown", "text"])
+@pytest.mark.parametrize("include_system", [True, False])
+def test_save_agent_context_matches_dump(tmp_path: Path, fmt: str, include_system: bool) -> None:
+    target = tmp_path / "ctx.out"
+    save_agent_context(_sample_history(), target, output_format=fmt, include_system=include_system)
+
+    expected = dump_agent_context(
+        _sample_history(), output_format=fmt, include_system=include_system
+    )
+    assert target.read_text("utf-8") == expected
+
+
+def test_save_agent_context_empty_history_writes_empty_array(tmp_path: Path) -> None:
+    target = tmp_path / "ctx.json"
+    save_agent_context([], target, output_format="json")
+    assert target.read_text("utf-8") == "[]"
+
+
+def test_save_agent_context_recreates_removed_parent_dir(tmp_path: Path) -> None:
+    target = tmp_path / "exports" / "ctx.json"
+    save_agent_context([], target)
+    target.unlink()
+    target.parent.rmdir()
+
+    save_agent_context([], target)
+    assert target.read_text("utf-8") == "[]"
+
+
+def test_jsonl_save_append_and_load_round_trip(tmp_path: Path) -> None:
+    target = tmp_path / "history.jsonl"
+    history = _sample_history()
+    save_agent_context(history[:2], target, output_format="jsonl")
+    for msg in history[2:]:
+        append_agent_message(target, msg)
+
+    assert load_jsonl_history(target) == history
+    assert target.read_text("utf-8").count("\n") == len(history)
+
+
+def test_load_jsonl_history_falls_back_to_json(tmp_path: Path) -> None:
+    history = _sample_history()
+    save_agent_context(history, tmp_path / "history.json")
+
+    assert load_jsonl_history(tmp_path / "history.json") == history
+    assert load_jsonl_history(tmp_path / "history.jsonl") == history
+
+
 def test_get_context_summary_returns_stats_dict() -> None:
     summary = get_context_summary(_sample_history())
 
@@ -59,3 +138,99 @@ def test_get_context_summary_returns_stats_dict() -> None:
     assert isinstance(summary["unique_tools_used"], list)
     assert "list_dir" in summary["unique_tools_used"]
     assert "project_instructions" in summary
+
+
+def test_get_context_summary_estimate_ignores_null_content() -> None:
+    history = [
+        {"role": "user", "content": "x" * 40},
+        {"role": "assistant", "content": None, "tool_calls": []},
+    ]
+    assert get_context_summary(history)["total_tokens_estimate"] == 10
+
+
+def test_get_context_summary_handles_null_tool_calls() -> None:
+    history = [
+        {"role": "assistant", "content": "hi", "tool_calls": None},
+        {"role": "developer", "content": "note"},
+    ]
+    summary = get_context_summary(history)
+
+    assert summary["total_tool_calls"] == 0
+    assert summary["assistant_messages"] == 1
+    assert summary["total_messages"] == 2
+
+
+def test_get_context_summary_counts_tokens_and_tool_calls() -> None:
+    history = _sample_history()
+    history[2]["prompt_tokens"] = 120
+    history[2]["completion_tokens"] = 30
+
+    summary = get_context_summary(history)
+
+    assert summary["system_messages"] == 1
+    assert summary["total_tool_calls"] == 1
+    assert summary["using_actual_tokens"] is True
+    assert summary["total_tokens"] == 150
+    # "sys" + "hello" + "hi" + "ok" = 12 chars -> 3 tokens
+    assert summary["total_tokens_estimate"] == 3
+
+
+def test_agents_md_metadata_is_cached_until_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = history_export._get_agents_md_metadata()
+    assert first["status"] == "present"
+
+    calls = 0
+    real_sha256 = history_export.hashlib.sha256
+
+    def _counting_sha256(*args: object) -> object:
+        nonlocal calls
+        calls += 1
+        return real_sha256(*args)
+
+    monkeypatch.setattr(history_export.hashlib, "sha256", _counting_sha256)
+
+    assert history_export._get_agents_md_metadata() == first
+    assert calls == 0
+
+    (tmp_path / "AGENTS.md").write_text("# Changed\n\nMore lines here.\nAnd more.\n", "utf-8")
+    changed = history_export._get_agents_md_metadata()
+    assert calls == 1
+    assert changed["sha256"] != first["sha256"]
+
+
+def test_count_lines_and_hash_matches_whole_file(tmp_path: Path) -> None:
+    target = tmp_path / "big.md"
+    raw = b"line\n" * 50_000 + b"tail"
+    target.write_bytes(raw)
+
+    lines, digest = history_export._count_lines_and_hash(target, chunk_size=4096)
+
+    assert lines == raw.count(b"\n") + 1
+    assert digest == history_export.hashlib.sha256(raw).hexdigest()[:12]
+
+
+def test_format_context_summary_prints_all_sections(capsys: pytest.CaptureFixture[str]) -> None:
+    format_context_summary(_sample_history())
+    out = capsys.readouterr().out
+
+    for heading in ("Context summary", "By role:", "Tools:", "Token usage:", "Context window:"):
+        assert heading in out
+    assert "Unique tools used: list_dir" in out
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1024, "1 KB"),
+        (1024**2 - 1, "1023 KB"),
+        (3 * 1024**3 + 5, "3 GB"),
+        (1024**4, "1.0 TB"),
+        (1536 * 1024**4, "1536.0 TB"),
+    ],
+)
+def test_format_size_picks_unit(size: int, expected: str) -> None:
+    assert history_export._format_size(size) == expected
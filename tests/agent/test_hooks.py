@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import json
+import os
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -16,6 +20,7 @@ from meto.agent.hooks import (
     is_python_script,
     run_python_script,
 )
+from meto.agent.shell import split_command
 
 # ============================================================================
 # Tests for is_python_script()
@@ -69,6 +74,15 @@ def test_is_python_script_windows_executable() -> None:
 # ============================================================================
 
 
+def test_split_command_keeps_windows_backslashes_and_groups_quotes() -> None:
+    assert split_command(r"""C:\tools\hook.py --flag "a b" 'c d'""") == [
+        r"C:\tools\hook.py",
+        "--flag",
+        "a b",
+        "c d",
+    ]
+
+
 def test_run_python_script_executes_successfully(tmp_path: Path) -> None:
     """Test that run_python_script executes a script successfully."""
     script = tmp_path / "test.py"
@@ -355,6 +369,73 @@ def test_hooks_config_load_from_yaml(tmp_path: Path) -> None:
     assert cfg.hooks[0].name == "ok"
 
 
+def test_hooks_config_load_from_yaml_is_cached_until_file_changes(tmp_path: Path) -> None:
+    p = tmp_path / "hooks.yaml"
+    p.write_text(
+        "hooks:\n  - name: one\n    event: session_start\n    command: echo 1\n",
+        encoding="utf-8",
+    )
+
+    first = HooksConfig.load_from_yaml(p)
+    assert HooksConfig.load_from_yaml(p) is first
+
+    p.write_text(
+        "hooks:\n  - name: two\n    event: session_start\n    command: echo 22\n",
+        encoding="utf-8",
+    )
+    assert [h.name for h in HooksConfig.load_from_yaml(p).hooks] == ["two"]
+
+
+def test_hooks_config_load_from_yaml_ignores_unknown_keys(tmp_path: Path) -> None:
+    p = tmp_path / "hooks.yaml"
+    p.write_text(
+        "hooks:\n  - name: ok\n    event: pre_tool_use\n    command: echo hi\n"
+        "    tools: [read_file]\n    timeout: 5\n    note: ignored\n",
+        encoding="utf-8",
+    )
+
+    cfg = HooksConfig.load_from_yaml(p)
+    assert cfg.hooks == [
+        HookConfig(
+            name="ok", event="pre_tool_use", tools=["read_file"], command="echo hi", timeout=5
+        )
+    ]
+
+
+def test_hooks_config_load_from_yaml_invalid_event_yields_empty_config(tmp_path: Path) -> None:
+    p = tmp_path / "hooks.yaml"
+    p.write_text(
+        "hooks:\n  - name: bad\n    event: on_save\n    command: echo hi\n",
+        encoding="utf-8",
+    )
+
+    assert HooksConfig.load_from_yaml(p).hooks == []
+
+
+@pytest.mark.parametrize("timeout", ['"30"', "30.0", "30"])
+def test_hooks_config_load_from_yaml_coerces_timeout(tmp_path: Path, timeout: str) -> None:
+    p = tmp_path / "hooks.yaml"
+    p.write_text(
+        f"hooks:\n  - name: ok\n    event: pre_tool_use\n    command: echo hi\n"
+        f"    timeout: {timeout}\n",
+        encoding="utf-8",
+    )
+
+    assert [h.timeout for h in HooksConfig.load_from_yaml(p).hooks] == [30]
+
+
+@pytest.mark.parametrize("timeout", [2.5, "soon", None, True])
+def test_hook_config_rejects_non_integral_timeout(timeout: object) -> None:
+    with pytest.raises(ValueError, match="Hook timeout"):
+        HookConfig(name="t", event="session_start", command="noop", timeout=timeout)  # pyright: ignore[reportArgumentType]
+
+
+@pytest.mark.parametrize("name", ["", "has space", "trailing\n", "dot.name"])
+def test_hook_config_rejects_invalid_names(name: str) -> None:
+    with pytest.raises(ValueError, match="Hook name"):
+        HookConfig(name=name, event="session_start", command="noop")
+
+
 def test_hooks_manager_get_hooks_for_event_filters_by_tool() -> None:
     cfg = HooksConfig(
         hooks=[
@@ -369,6 +450,8 @@ def test_hooks_manager_get_hooks_for_event_filters_by_tool() -> None:
 
     hooks_for_write = mgr.get_hooks_for_event("pre_tool_use", tool_name="write_file")
     assert [h.name for h in hooks_for_write] == ["b"]
+    assert mgr.get_hooks_for_event("pre_tool_use", tool_name="write_file") is hooks_for_write
+    assert mgr.get_hooks_for_event("post_tool_use", tool_name="write_file") == ()
 
 
 def test_run_hooks_executes_real_subprocess_and_can_block(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -401,7 +484,165 @@ def test_run_hooks_executes_real_subprocess_and_can_block(monkeypatch: pytest.Mo
     assert results[0].blocked is True
 
 
+def test_run_hooks_caps_captured_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(hooks_mod, "pick_shell_runner", lambda: [sys.executable, "-c"])
+    monkeypatch.setattr(hooks_mod, "HOOK_OUTPUT_LIMIT", 1000)
+
+    cfg = HooksConfig(
+        hooks=[
+            HookConfig(
+                name="chatty",
+                event="post_tool_use",
+                tools=[],
+                command="import sys; sys.stdout.write('x' * 200_000); sys.stderr.write('err')",
+                timeout=5,
+            )
+        ]
+    )
+    mgr = HooksManager(config=cfg)
+
+    [result] = mgr.run_hooks("post_tool_use", session_id="s1", tool="read_file")
+    assert result.success is True
+    assert result.stdout == "x" * 1000 + "\n... (truncated to 1000 bytes)"
+    assert result.stderr == "err"
+
+
+def test_run_hooks_passes_hook_input_to_every_hook(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(hooks_mod, "pick_shell_runner", lambda: [sys.executable, "-c"])
+    monkeypatch.setenv("METO_HOOK_TEST_VAR", "inherited")
+
+    command = (
+        "import json, os; d = json.loads(os.environ['HOOK_INPUT_JSON']); "
+        "print(d['tool'], os.environ['METO_HOOK_TEST_VAR'])"
+    )
+    cfg = HooksConfig(
+        hooks=[
+            HookConfig(name="first", event="post_tool_use", command=command, timeout=5),
+            HookConfig(name="second", event="post_tool_use", command=command, timeout=5),
+        ]
+    )
+    results = HooksManager(config=cfg).run_hooks("post_tool_use", session_id="s1", tool="ls")
+
+    assert [r.stdout.strip() for r in results] == ["ls inherited", "ls inherited"]
+
+
+def test_hook_input_to_json_round_trips() -> None:
+    hook_input = hooks_mod.HookInput(
+        event="post_tool_use",
+        session_id="s1",
+        tool="write_file",
+        params={"path": "héllo.txt", 1: "non-str key"},
+        result="ok",
+    )
+
+    assert json.loads(hook_input.to_json()) == {
+        "event": "post_tool_use",
+        "session_id": "s1",
+        "tool": "write_file",
+        "params": {"path": "héllo.txt", "1": "non-str key"},
+        "result": "ok",
+    }
+    # The documented HOOK_INPUT_JSON format: compact, with non-ASCII escaped.
+    assert hook_input.to_json().startswith('{"event":"post_tool_use","session_id":"s1",')
+    assert '"path":"h\\u00e9llo.txt"' in hook_input.to_json()
+
+
+def test_run_hooks_without_hooks_does_not_serialize_input(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _fail(_self: object) -> str:
+        raise AssertionError("HookInput should not be serialized")
+
+    monkeypatch.setattr(hooks_mod.HookInput, "to_json", _fail)
+    mgr = HooksManager(config=HooksConfig())
+
+    assert mgr.run_hooks("pre_tool_use", session_id="s1", tool="ls", params={"x": 1}) == []
+
+
+def test_run_hooks_runs_non_blocking_events_concurrently(monkeypatch: pytest.MonkeyPatch) -> None:
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _fake_run_hook(
+        self: HooksManager, hook: HookConfig, hook_input: object, env: object
+    ) -> hooks_mod.HookResult:
+        barrier.wait()  # Deadlocks (and times out) if hooks run one after another
+        return hooks_mod.HookResult(hook_name=hook.name, success=True, exit_code=0)
+
+    monkeypatch.setattr(HooksManager, "_run_hook", _fake_run_hook)
+    cfg = HooksConfig(
+        hooks=[
+            HookConfig(name="first", event="post_tool_use", command="noop"),
+            HookConfig(name="second", event="post_tool_use", command="noop"),
+        ]
+    )
+
+    results = HooksManager(config=cfg).run_hooks("post_tool_use", session_id="s1", tool="ls")
+    assert [r.hook_name for r in results] == ["first", "second"]
+
+
+def test_run_hooks_sequential_when_parallel_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    order: list[str] = []
+
+    def _fake_run_hook(
+        self: HooksManager, hook: HookConfig, hook_input: object, env: object
+    ) -> hooks_mod.HookResult:
+        order.append(threading.current_thread().name)
+        return hooks_mod.HookResult(hook_name=hook.name, success=True, exit_code=0)
+
+    monkeypatch.setattr(HooksManager, "_run_hook", _fake_run_hook)
+    monkeypatch.setattr(hooks_mod.settings, "HOOKS_PARALLEL", False)
+    cfg = HooksConfig(
+        hooks=[
+            HookConfig(name="first", event="session_start", command="noop"),
+            HookConfig(name="second", event="session_start", command="noop"),
+        ]
+    )
+
+    HooksManager(config=cfg).run_hooks("session_start", session_id="s1")
+    assert order == [threading.current_thread().name] * 2
+
+
 def test_get_hooks_manager_is_cached_and_resettable() -> None:
     a = get_hooks_manager()
     b = get_hooks_manager()
     assert a is b
+
+
+@pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+@pytest.mark.parametrize(
+    ("command", "timed_out"),
+    [
+        # The hook outlives its timeout while a child holds the output pipes.
+        ("import subprocess, time; subprocess.Popen(['sleep', '8']); time.sleep(8)", True),
+        # The hook exits at once but leaves a backgrounded child holding the pipes.
+        ("import subprocess; subprocess.Popen(['sleep', '8']); print('started')", False),
+    ],
+)
+def test_run_hooks_does_not_wait_for_lingering_children(
+    monkeypatch: pytest.MonkeyPatch, command: str, timed_out: bool
+) -> None:
+    monkeypatch.setattr(hooks_mod, "pick_shell_runner", lambda: [sys.executable, "-c"])
+    cfg = HooksConfig(
+        hooks=[HookConfig(name="slow", event="pre_tool_use", tools=[], command=command, timeout=1)]
+    )
+    mgr = HooksManager(config=cfg)
+
+    start = time.monotonic()
+    [result] = mgr.run_hooks("pre_tool_use", session_id="s1", tool="read_file")
+
+    assert time.monotonic() - start < 4
+    assert result.blocked is timed_out
+    if not timed_out:
+        assert result.stdout == "started\n"
+
+
+def test_run_hooks_translates_crlf_output(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(hooks_mod, "pick_shell_runner", lambda: [sys.executable, "-c"])
+    command = "import sys; sys.stdout.buffer.write(b'one\\r\\ntwo\\r\\n')"
+    cfg = HooksConfig(
+        hooks=[HookConfig(name="crlf", event="post_tool_use", tools=[], command=command)]
+    )
+
+    [result] = HooksManager(config=cfg).run_hooks("post_tool_use", session_id="s1", tool="ls")
+
+    assert result.stdout == "one\ntwo\n"
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from meto.agent import _json
+
+MESSAGE = {"role": "assistant", "content": 'héllo "x"', "tool_calls": [{"id": "tc_1"}]}
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "expected"),
+    [
+        ({}, json.dumps(MESSAGE, separators=(",", ":"), ensure_ascii=False)),
+        ({"newline": True}, json.dumps(MESSAGE, separators=(",", ":"), ensure_ascii=False) + "\n"),
+        ({"indent": True}, json.dumps(MESSAGE, indent=2, ensure_ascii=False)),
+        ({"indent": True, "ensure_ascii": True}, json.dumps(MESSAGE, indent=2)),
+    ],
+)
+def test_dumps_matches_stdlib_with_and_without_orjson(
+    monkeypatch: pytest.MonkeyPatch, kwargs: dict[str, Any], expected: str
+) -> None:
+    assert _json.dumps(MESSAGE, **kwargs) == expected.encode("utf-8")
+
+    monkeypatch.setattr(_json, "orjson", None)
+    assert _json.dumps(MESSAGE, **kwargs) == expected.encode("utf-8")
+
+
+@pytest.mark.parametrize("value", [2**70, "\ud800"])
+def test_dumps_falls_back_for_values_orjson_rejects(value: Any) -> None:
+    assert json.loads(_json.dumps({"v": value})) == {"v": value}
+
+
+@pytest.mark.parametrize(
+    ("raw", "expected"),
+    [('{"path": "a.txt", "limit": 5}', {"path": "a.txt", "limit": 5}), ('{"x": NaN}', None)],
+)
+def test_loads_matches_stdlib(raw: str, expected: dict[str, Any] | None) -> None:
+    parsed = _json.loads(raw)
+    if expected is None:
+        assert math.isnan(parsed["x"])
+    else:
+        assert parsed == expected == json.loads(raw)
+
+
+def test_loads_raises_json_decode_error() -> None:
+    with pytest.raises(json.JSONDecodeError):
+        _json.loads("{not json")
+
+
+@pytest.mark.parametrize("created", [0.0, 1_700_000_000.25, 1_700_000_000.999999, 1_700_000_001.5])
+def test_iso_timestamp_matches_datetime(created: float) -> None:
+    expected = datetime.fromtimestamp(created, tz=UTC)
+    assert datetime.fromisoformat(_json.iso_timestamp(created)) == expected
+
+
+def test_iso_timestamp_defaults_to_now(monkeypatch: pytest.MonkeyPatch) -> None:
+    for ns in (1_700_000_000_000_000_000, 1_700_000_000_123_456_000, 1_700_000_001_000_001_000):
+        monkeypatch.setattr(_json.time, "time_ns", lambda ns=ns: ns)
+        expected = datetime.fromtimestamp(ns // 1000 / 1_000_000, tz=UTC)
+        assert datetime.fromisoformat(_json.iso_timestamp()) == expected
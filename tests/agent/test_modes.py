@@ -21,7 +21,7 @@ def test_plan_mode_implements_session_mode_contract() -> None:
 def test_generate_plan_filename_is_stable_with_injected_now(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
-    monkeypatch.setattr(plan_mod.random, "choices", lambda *_a, **_k: list("abcdef"))
+    monkeypatch.setattr(plan_mod.secrets, "token_hex", lambda _nbytes: "abcdef")
     now = datetime(2026, 1, 31, 12, 0, 0, tzinfo=UTC)
 
     name = _generate_plan_filename(now=now)
@@ -37,3 +37,27 @@ def test_external_path_permission_check(
 def test_external_path_permission_check_fail_closed_on_weird_value() -> None:
     check = ExternalPathPermissionCheck()
     assert check.is_required({"path": object()}) is True
+
+
+def test_external_path_permission_check_follows_cwd_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    check = ExternalPathPermissionCheck()
+    first = check.allowed_dirs
+    assert check.allowed_dirs is first
+
+    other = tmp_path / "other"
+    other.mkdir()
+    monkeypatch.chdir(other)
+
+    assert check.allowed_dirs[0] == other.resolve()
+    assert check.is_required({"path": str(tmp_path / "sibling.txt")}) is True
+
+
+def test_external_path_permission_check_matches_whole_path_components(tmp_path: Path) -> None:
+    check = ExternalPathPermissionCheck()
+
+    assert check.is_required({"path": str(tmp_path)}) is False
+    assert check.is_required({"path": "relative/file.txt"}) is False
+    # Shares a string prefix with cwd but is a different directory.
+    assert check.is_required({"path": f"{tmp_path}-other/file.txt"}) is True
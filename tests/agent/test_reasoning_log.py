@@ -5,6 +5,7 @@ from pathlib import Path
 
 import pytest
 
+from meto.agent import _json, reasoning_log
 from meto.agent.hooks import HookResult
 from meto.agent.reasoning_log import ReasoningLogger
 from meto.conf import Settings
@@ -51,6 +52,8 @@ def sample_hook_result() -> HookResult:
 
 def get_log_entries(tmp_settings: Settings) -> list[dict]:
     """Helper to read all log entries from temp settings."""
+    # The shared writer thread marks each record done once it is written.
+    reasoning_log._log_queue.join()
     log_files = list(tmp_settings.LOG_DIR.glob("*.jsonl"))
     if not log_files:
         return []
@@ -375,3 +378,85 @@ def test_log_hook_result_multiple_hooks(
         e["hook_name"] == "hook-2" and e["success"] is False and e["error"] == "Error 2"
         for e in hook_entries
     )
+
+
+def test_log_tool_selection_logs_arguments(
+    reasoning_logger: ReasoningLogger, tmp_settings: Settings
+) -> None:
+    reasoning_logger.log_tool_selection("read_file", {"path": "notes/héllo.txt", "limit": 5})
+
+    message = get_log_entries(tmp_settings)[-1]["message"]
+    assert message.startswith("Tool selected: read_file with args: {")
+    assert json.loads(message.split("with args: ", 1)[1]) == {"path": "notes/héllo.txt", "limit": 5}
+
+
+def test_reused_run_id_does_not_duplicate_entries(
+    reasoning_logger: ReasoningLogger, tmp_settings: Settings
+) -> None:
+    import logging
+    from unittest.mock import patch
+
+    with patch("meto.agent.reasoning_log.settings", tmp_settings):
+        second = ReasoningLogger(
+            session_id="test-session",
+            agent_name="test-agent",
+            agent_run_id=reasoning_logger.agent_run_id,
+        )
+    try:
+        second.log_skill_loaded("demo")
+    finally:
+        second.close()
+
+    entries = [e for e in get_log_entries(tmp_settings) if e["message"] == "Skill loaded: demo"]
+    assert len(entries) == 1
+    assert second._logger.name not in logging.Logger.manager.loggerDict
+
+
+def test_log_tool_execution_keeps_full_result_in_file(
+    reasoning_logger: ReasoningLogger, tmp_settings: Settings
+) -> None:
+    result = "x" * 500
+    reasoning_logger.log_tool_execution("run_shell", result, error=True)
+
+    entry = get_log_entries(tmp_settings)[-1]
+    assert entry["level"] == "ERROR"
+    assert entry["message"] == f"Tool 'run_shell' result: {result}"
+
+
+@pytest.mark.parametrize(
+    ("fragment", "expected"),
+    [
+        ("", "base prompt, AGENTS.md, skills"),
+        ("\n\n----- PLAN MODE ACTIVE -----\nPlan first.", "base prompt, AGENTS.md, skills, mode"),
+    ],
+)
+def test_log_system_prompt_detects_sections(
+    reasoning_logger: ReasoningLogger,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    fragment: str,
+    expected: str,
+) -> None:
+    monkeypatch.setattr(reasoning_log.settings, "LOG_SYSTEM_PROMPT", True)
+    prompt = (
+        "You are a CLI coding agent.\n\n"
+        "----- BEGIN AGENTS.md (project instructions) -----\nBe nice.\n"
+        "----- END AGENTS.md -----\n\n"
+        "Available skills:\n- commit: Write commits" + fragment
+    )
+
+    reasoning_logger.log_system_prompt(prompt)
+
+    assert f"System Prompt sections: {expected}" in capsys.readouterr().err
+
+
+def test_json_formatter_stdlib_fallback_matches_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    import logging
+
+    record = logging.LogRecord("agent", logging.INFO, __file__, 1, 'héllo "x"', None, None)
+    record.session_id = "s1"
+    formatter = reasoning_log.JSONFormatter()
+
+    with_orjson = formatter.format(record)
+    monkeypatch.setattr(_json, "orjson", None)
+    assert formatter.format(record) == with_orjson
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
+import json
 import os
 import re
 from pathlib import Path
 
+import pytest
+
 from meto.agent.modes.plan import PlanMode
 from meto.agent.session import (
     FileSessionLogger,
     NullSessionLogger,
     Session,
     generate_session_id,
+    get_session_info,
     list_session_files,
     load_session,
 )
@@ -29,10 +33,51 @@ def test_file_session_logger_writes_jsonl(tmp_path: Path) -> None:
 
     session_file = tmp_path / "session-test123.jsonl"
     lines = session_file.read_text("utf-8").splitlines()
-    assert len(lines) == 3
-    assert '"role": "user"' in lines[0]
-    assert '"role": "assistant"' in lines[1]
-    assert '"role": "tool"' in lines[2]
+    assert [json.loads(line)["role"] for line in lines] == ["user", "assistant", "tool"]
+
+
+def test_file_session_logger_keeps_one_handle_and_reopens_after_close(tmp_path: Path) -> None:
+    logger = FileSessionLogger(session_id="handle", session_dir=tmp_path)
+    session_file = tmp_path / "session-handle.jsonl"
+
+    logger.log_user("one")
+    fd = logger._fd
+    logger.log_user("two")
+    assert logger._fd == fd
+    assert len(session_file.read_text("utf-8").splitlines()) == 2
+
+    logger.close()
+    assert logger._fd is None
+    logger.log_user("three")
+    logger.close()
+    assert len(session_file.read_text("utf-8").splitlines()) == 3
+
+
+def test_file_session_logger_close_waits_for_in_flight_append(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import threading
+
+    logger = FileSessionLogger(session_id="race", session_dir=tmp_path)
+    real_write = os.write
+    closers: list[threading.Thread] = []
+
+    def write_while_closing(fd: int, data: bytes) -> int:
+        # Close from another thread in the middle of the append; it must wait.
+        closer = threading.Thread(target=logger.close)
+        closer.start()
+        closer.join(timeout=0.2)
+        closers.append(closer)
+        return real_write(fd, data)
+
+    monkeypatch.setattr(os, "write", write_while_closing)
+    logger.log_user("one")
+    monkeypatch.undo()
+    closers[0].join()
+
+    assert logger._fd is None
+    lines = (tmp_path / "session-race.jsonl").read_text("utf-8").splitlines()
+    assert [json.loads(line)["content"] for line in lines] == ["one"]
 
 
 def test_load_session_returns_openai_style_history(tmp_path: Path) -> None:
@@ -49,6 +94,20 @@ def test_load_session_returns_openai_style_history(tmp_path: Path) -> None:
     assert hist[2]["tool_call_id"] == "tc"
 
 
+@pytest.mark.parametrize(
+    ("data", "expected"),
+    [(b"", 0), (b'{"a":1}\n', 1), (b'{"a":1}\n{"b":2}', 2), (b"x\n" * 40000, 40000)],
+)
+def test_get_session_info_counts_lines(tmp_path: Path, data: bytes, expected: int) -> None:
+    path = tmp_path / "session-count.jsonl"
+    path.write_bytes(data)
+
+    info = get_session_info(path)
+
+    assert info["id"] == "count"
+    assert info["message_count"] == expected
+
+
 def test_list_session_files_sorted_by_mtime_desc(tmp_path: Path) -> None:
     p1 = tmp_path / "session-a.jsonl"
     p2 = tmp_path / "session-b.jsonl"
@@ -118,3 +177,27 @@ def test_session_renew_keeps_history_and_changes_id(tmp_path: Path) -> None:
     assert new_file.exists()
     lines = new_file.read_text("utf-8").splitlines()
     assert len(lines) == 2
+
+
+def test_session_clear_history_closes_old_logger(tmp_path: Path) -> None:
+    session_dir = tmp_path / "sessions"
+    session_dir.mkdir(exist_ok=True)
+
+    class TmpFileLogger(FileSessionLogger):
+        def __init__(self, session_id: str | None = None) -> None:
+            super().__init__(session_id=session_id, session_dir=session_dir)
+
+    session = Session(session_logger_cls=TmpFileLogger, yolo_mode=True)
+    old_id = session.session_id
+    old_logger = session.session_logger
+    session.history.append({"role": "user", "content": "u"})
+    old_logger.log_user("u")
+    assert isinstance(old_logger, FileSessionLogger)
+    assert old_logger._fd is not None
+
+    session.clear_history()
+
+    assert old_logger._fd is None
+    assert session.history == []
+    assert session.session_id != old_id
+    assert session.session_logger is not old_logger
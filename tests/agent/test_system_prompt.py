@@ -3,9 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 from types import SimpleNamespace
 
+import pytest
+
 from meto.agent.modes.plan import PlanMode
 from meto.agent.session import NullSessionLogger, Session
-from meto.agent.system_prompt import build_system_prompt
+from meto.agent.system_prompt import build_system_prompt, build_system_prompt_parts
 
 
 def test_build_system_prompt_includes_agents_md_and_agent_instructions(tmp_path: Path) -> None:
@@ -33,3 +35,39 @@ def test_build_system_prompt_includes_mode_fragment_and_rereads_agents_md(tmp_pa
 
     p2 = build_system_prompt(session=session, agent=None)
     assert "New instructions." in p2
+
+
+def test_build_system_prompt_reuses_cached_prompt_until_agents_md_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reads: list[Path] = []
+    original_read_text = Path.read_text
+
+    def counting_read_text(self: Path, *args: object, **kwargs: object) -> str:
+        reads.append(self)
+        return original_read_text(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "read_text", counting_read_text)
+
+    p1 = build_system_prompt_parts()
+    assert build_system_prompt_parts() is p1
+    assert len(reads) == 1
+
+    (tmp_path / "AGENTS.md").write_text("# Changed\n\nLonger replacement text.\n")
+    static, _dynamic = build_system_prompt_parts()
+    assert "Longer replacement text." in static
+    assert len(reads) == 2
+
+
+def test_build_system_prompt_parts_keep_mode_fragment_out_of_the_prefix(tmp_path: Path) -> None:
+    session = Session(session_logger_cls=NullSessionLogger, yolo_mode=True)
+    static_before, _ = build_system_prompt_parts(session=session)
+
+    session.enter_mode(PlanMode())
+    static, dynamic = build_system_prompt_parts(session=session)
+
+    assert static == static_before
+    assert static.rstrip().endswith("----- END AGENTS.md -----")
+    assert dynamic.startswith("Available skills:")
+    assert "PLAN MODE ACTIVE" in dynamic
+    assert build_system_prompt(session=session) == f"{static}\n{dynamic}"
@@ -6,6 +6,7 @@ import pytest
 
 import meto.agent.tool_runner as tool_runner
 from meto.agent.session import NullSessionLogger, Session
+from meto.agent.shell import pick_shell_runner
 
 
 def test_run_tool_unknown_tool_returns_error_string() -> None:
@@ -38,3 +39,8 @@ def test_permission_prompt_can_cancel_before_network(monkeypatch: pytest.MonkeyP
 
     out = tool_runner.run_tool("fetch", {"url": "https://example.com"}, session=session)
     assert out == "(fetch cancelled by user)"
+
+
+def test_pick_shell_runner_is_cached() -> None:
+    pick_shell_runner.cache_clear()
+    assert pick_shell_runner() is pick_shell_runner()